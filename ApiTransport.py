@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import httplib2
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+from google import genai
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Transport modes:
+#   live    - talk to the real YouTube and Gemini APIs (default)
+#   record  - talk to the real APIs and save every response as a cassette
+#   replay  - serve responses from saved cassettes, no network or keys needed
+#   standin - point both clients at the local stand-in server (benchmarks/standin_server.py)
+API_MODES = ('live', 'record', 'replay', 'standin')
+
+YOUTUBE_API_SERVICE_NAME = 'youtube'
+YOUTUBE_API_VERSION = 'v3'
+
+
+def get_api_mode():
+    mode = os.getenv('POP_API_MODE', 'live').lower()
+    if mode not in API_MODES:
+        raise ValueError(f"POP_API_MODE must be one of {', '.join(API_MODES)}, got '{mode}'")
+    return mode
+
+
+def get_cassette_dir():
+    return os.getenv('POP_CASSETTE_DIR', 'cassettes')
+
+
+def get_standin_url():
+    return os.getenv('POP_STANDIN_URL', 'http://127.0.0.1:8765').rstrip('/')
+
+
+def _cassette_path(cassette_dir, service, key):
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(cassette_dir, service, f'{digest}.json')
+
+
+def _youtube_request_key(method, uri):
+    # Drop the API key so cassettes recorded with one key replay with any other
+    base, _, query = uri.partition('?')
+    params = sorted(p for p in query.split('&') if p and not p.startswith('key='))
+    return f"{method} {base}?{'&'.join(params)}"
+
+
+class PooledHttp:
+    """httplib2-compatible wrapper that lends each request an idle connection from a pool.
+
+    httplib2.Http is not thread-safe and Streamlit runs every rerun on a new thread, so a shared
+    client must not share one Http. A per-thread Http would open a new connection (and TLS
+    handshake) on every rerun; pooled connections go back after each request and keep-alive is
+    reused across reruns. The pool grows to the peak number of concurrent requests.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def request(self, *args, **kwargs):
+        with self._lock:
+            http = self._idle.pop() if self._idle else None
+        if http is None:
+            http = self.factory()
+        try:
+            return http.request(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._idle.append(http)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for http in idle:
+            if hasattr(http, 'close'):
+                http.close()
+
+
+class RecordingHttp:
+    """httplib2-compatible wrapper that saves each YouTube response to a cassette."""
+
+    def __init__(self, cassette_dir, http=None):
+        self.cassette_dir = cassette_dir
+        self.http = http or httplib2.Http()
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        response, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        path = _cassette_path(self.cassette_dir, 'youtube', _youtube_request_key(method, uri))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'request': {'method': method, 'uri': _youtube_request_key(method, uri)},
+                'status': response.status,
+                'headers': dict(response),
+                'content': content.decode('utf-8'),
+            }, f)
+        return response, content
+
+
+class ReplayHttp:
+    """httplib2-compatible stand-in that answers YouTube requests from saved cassettes."""
+
+    def __init__(self, cassette_dir):
+        self.cassette_dir = cassette_dir
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        key = _youtube_request_key(method, uri)
+        path = _cassette_path(self.cassette_dir, 'youtube', key)
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded YouTube response for {key}")
+        with open(path, encoding='utf-8') as f:
+            cassette = json.load(f)
+        headers = dict(cassette['headers'])
+        headers['status'] = str(cassette['status'])
+        return httplib2.Response(headers), cassette['content'].encode('utf-8')
+
+
+def build_youtube_client(developer_key, mode=None):
+    # Create the googleapiclient resource for the selected transport mode
+    mode = mode or get_api_mode()
+    if mode == 'live':
+        return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=developer_key,
+                     http=PooledHttp(build_http))
+    if mode == 'record':
+        cassette_dir = get_cassette_dir()
+        return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=developer_key,
+                     http=PooledHttp(lambda: RecordingHttp(cassette_dir)))
+    if mode == 'replay':
+        return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=developer_key,
+                     http=ReplayHttp(get_cassette_dir()))
+    return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=developer_key or 'standin',
+                 http=PooledHttp(httplib2.Http),
+                 client_options={'api_endpoint': f'{get_standin_url()}/youtube/v3/'})
+
+
+def _gemini_request_key(model, contents):
+    return f"{model}\n{contents}"
+
+
+class _ReplayResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _RecordingModels:
+    def __init__(self, models, cassette_dir):
+        self._models = models
+        self.cassette_dir = cassette_dir
+
+    def generate_content(self, model, contents, config=None):
+        response = self._models.generate_content(model=model, contents=contents, config=config)
+        path = _cassette_path(self.cassette_dir, 'gemini', _gemini_request_key(model, contents))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'model': model, 'text': response.text}, f)
+        return response
+
+
+class _ReplayModels:
+    def __init__(self, cassette_dir):
+        self.cassette_dir = cassette_dir
+
+    def generate_content(self, model, contents, config=None):
+        path = _cassette_path(self.cassette_dir, 'gemini', _gemini_request_key(model, contents))
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded Gemini response for model {model}")
+        with open(path, encoding='utf-8') as f:
+            return _ReplayResponse(json.load(f)['text'])
+
+
+class RecordingGeminiClient:
+    """Wraps a genai.Client and saves each generate_content reply to a cassette."""
+
+    def __init__(self, client, cassette_dir):
+        self.models = _RecordingModels(client.models, cassette_dir)
+
+
+class ReplayGeminiClient:
+    """Answers generate_content calls from saved cassettes without contacting Gemini."""
+
+    def __init__(self, cassette_dir):
+        self.models = _ReplayModels(cassette_dir)
+
+
+def build_gemini_client(api_key, mode=None):
+    # Create a client exposing models.generate_content for the selected transport mode
+    mode = mode or get_api_mode()
+    if mode == 'live':
+        return genai.Client(api_key=api_key)
+    if mode == 'record':
+        return RecordingGeminiClient(genai.Client(api_key=api_key), get_cassette_dir())
+    if mode == 'replay':
+        return ReplayGeminiClient(get_cassette_dir())
+    return genai.Client(api_key=api_key or 'standin',
+                        http_options=types.HttpOptions(base_url=get_standin_url()))
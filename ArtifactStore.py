@@ -0,0 +1,183 @@
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a lock that only covers this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the CSV layout or scoring changes so old artifacts are never mixed with new ones
+ANALYSIS_VERSION = 'v2'
+
+# Layout: <root>/<analysis version>/<video id>/<artifact files>
+#                                             /.refs/<session id>   (one marker per active session)
+#        <root>/.lock                               (held while refs are changed or the store is evicted)
+REFS_DIR = '.refs'
+LOCK_NAME = '.lock'
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def get_artifact_root():
+    return os.path.abspath(os.getenv('POP_ARTIFACT_DIR', 'artifacts'))
+
+
+def get_budget_bytes():
+    return int(float(os.getenv('POP_ARTIFACT_BUDGET_MB', '512')) * 1024 * 1024)
+
+
+def get_ref_ttl():
+    # Sessions can disappear without releasing; refs untouched for this long no longer pin artifacts
+    return float(os.getenv('POP_ARTIFACT_REF_TTL', '3600'))
+
+
+def artifact_dir(video_id, version=ANALYSIS_VERSION):
+    if not VIDEO_ID_PATTERN.match(video_id):
+        raise ValueError(f"Invalid video id for artifact store: {video_id!r}")
+    return os.path.join(get_artifact_root(), version, video_id)
+
+
+def artifact_path(video_id, name, version=ANALYSIS_VERSION):
+    return os.path.join(artifact_dir(video_id, version), name)
+
+
+@contextmanager
+def atomic_write(path, mode='w', **open_kwargs):
+    # Write to a temporary file next to `path`, then rename it into place so readers never see a partial file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_fresh(path, source):
+    # True if `path` exists and was written no earlier than the `source` it is derived from
+    try:
+        return os.path.getmtime(path) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+_process_lock = threading.Lock()
+
+
+@contextmanager
+def store_lock():
+    # Exclusive lock over the whole store, shared by every thread and process using the same root
+    root = get_artifact_root()
+    os.makedirs(root, exist_ok=True)
+    with _process_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(root, LOCK_NAME), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def touch(video_id, version=ANALYSIS_VERSION):
+    # Mark an artifact as recently used for LRU eviction
+    directory = artifact_dir(video_id, version)
+    if os.path.isdir(directory):
+        os.utime(directory)
+
+
+def acquire(video_id, session_id, version=ANALYSIS_VERSION):
+    # Pin an artifact for a session; calling again refreshes the ref's heartbeat
+    # Held under the store lock so eviction cannot remove the directory between its check and delete
+    refs = os.path.join(artifact_dir(video_id, version), REFS_DIR)
+    with store_lock():
+        os.makedirs(refs, exist_ok=True)
+        with open(os.path.join(refs, session_id), 'a'):
+            pass
+        os.utime(os.path.join(refs, session_id))
+        touch(video_id, version)
+
+
+def release(video_id, session_id, version=ANALYSIS_VERSION):
+    ref = os.path.join(artifact_dir(video_id, version), REFS_DIR, session_id)
+    with store_lock():
+        try:
+            os.remove(ref)
+        except FileNotFoundError:
+            pass
+
+
+def active_refs(directory, now=None):
+    # Count refs whose heartbeat is within the TTL
+    refs = os.path.join(directory, REFS_DIR)
+    if not os.path.isdir(refs):
+        return 0
+    now = now or time.time()
+    ttl = get_ref_ttl()
+    count = 0
+    for entry in os.scandir(refs):
+        try:
+            if now - entry.stat().st_mtime < ttl:
+                count += 1
+        except FileNotFoundError:
+            continue
+    return count
+
+
+def _dir_size(directory):
+    total = 0
+    for path, _, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(path, name))
+            except FileNotFoundError:
+                continue
+    return total
+
+
+def evict(budget_bytes=None):
+    # Remove least recently used, unreferenced artifacts until the store fits in the disk budget
+    budget_bytes = get_budget_bytes() if budget_bytes is None else budget_bytes
+    root = get_artifact_root()
+    if not os.path.isdir(root):
+        return []
+
+    # The whole scan holds the store lock, so no session can acquire a video between its ref check and removal
+    with store_lock():
+        artifacts = []
+        for version in os.scandir(root):
+            if not version.is_dir():
+                continue
+            for video in os.scandir(version.path):
+                try:
+                    if video.is_dir():
+                        artifacts.append((video.stat().st_mtime, video.path, _dir_size(video.path)))
+                except FileNotFoundError:
+                    continue
+
+        total = sum(size for _, _, size in artifacts)
+        evicted = []
+        now = time.time()
+        for _, path, size in sorted(artifacts):
+            if total <= budget_bytes:
+                break
+            if active_refs(path, now):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted.append(path)
+            logger.info(f"Evicted artifact {path} ({size} bytes)")
+    return evicted
@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+import pandas as pd
+from ArtifactStore import artifact_path, atomic_write, is_fresh
+from Senti import load_scored_comments
+
+logger = logging.getLogger(__name__)
+
+# format -> (artifact name, mime type)
+EXPORT_FORMATS = {
+    'csv.gz': ('comments.csv.gz', 'application/gzip'),
+    'parquet': ('comments.parquet', 'application/vnd.apache.parquet'),
+}
+
+# One lock per export so concurrent sessions build each file once
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def export_path(video_id, fmt):
+    return artifact_path(video_id, EXPORT_FORMATS[fmt][0])
+
+
+def get_cached_export(video_id, csv_file, fmt):
+    # Return the export path if it was built from the current comments CSV, otherwise None
+    path = export_path(video_id, fmt)
+    return path if is_fresh(path, csv_file) else None
+
+
+def _write_export(df, path, fmt):
+    if fmt == 'csv.gz':
+        # mtime=0 keeps the gzip header stable, so the same comments give identical bytes
+        with atomic_write(path, 'wb') as f:
+            df.to_csv(f, index=False, encoding='utf-8',
+                      compression={'method': 'gzip', 'compresslevel': 6, 'mtime': 0})
+    else:
+        typed = df.assign(**{'Published At': pd.to_datetime(df['Published At'], errors='coerce', utc=True)})
+        with atomic_write(path, 'wb') as f:
+            typed.to_parquet(f, index=False, compression='zstd')
+
+
+def build_export(video_id, csv_file, fmt):
+    # Build the export from the scored comments unless an up-to-date one is already stored
+    with _build_locks_lock:
+        lock = _build_locks.setdefault((video_id, fmt), threading.Lock())
+    with lock:
+        path = get_cached_export(video_id, csv_file, fmt)
+        if path:
+            return path
+        path = export_path(video_id, fmt)
+        _write_export(load_scored_comments(csv_file), path, fmt)
+        logger.info(f"Export written to {path} ({os.path.getsize(path)} bytes)")
+        return path
+
+
+def export_loader(video_id, csv_file, fmt):
+    # Zero-argument callable for st.download_button: nothing is read until the user clicks
+    def load():
+        with open(build_export(video_id, csv_file, fmt), 'rb') as f:
+            return f.read()
+    return load
@@ -0,0 +1,69 @@
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from Senti import load_scored_comments
+
+SENTIMENT_LABELS = ['Positive', 'Negative', 'Neutral']
+SORT_OPTIONS = ['Most Recent', 'Most Liked', 'Most Replies', 'Username']
+
+
+class CommentIndex:
+    """Read-only query engine over a video's scored comments.
+
+    Sorted row permutations and packed per-sentiment bitmaps are computed once, so a
+    filter + sort + top-N query is a bitmap intersection and a gather, not a frame sort.
+    """
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.size = len(self.df)
+
+        likes = pd.to_numeric(self.df['Likes'], errors='coerce').fillna(0).to_numpy()
+        replies = pd.to_numeric(self.df['Reply Count'], errors='coerce').fillna(0).to_numpy()
+        published = pd.to_datetime(self.df['Published At'], errors='coerce', utc=True)
+        # Unparseable timestamps sort last under "Most Recent"
+        published_ns = published.fillna(pd.Timestamp.min.tz_localize('UTC')).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+        self.orders = {
+            'Most Recent': np.argsort(-published_ns, kind='stable'),
+            'Most Liked': np.argsort(-likes, kind='stable'),
+            'Most Replies': np.argsort(-replies, kind='stable'),
+            'Username': np.argsort(self.df['Username'].astype(str).to_numpy(), kind='stable'),
+        }
+        self.bitmaps = {
+            label: np.packbits((self.df['Sentiment'] == label).to_numpy())
+            for label in SENTIMENT_LABELS
+        }
+        self._comments_lower = self.df['Comment'].astype(str).str.lower()
+
+    def _mask(self, sentiment, search):
+        # Intersect the packed bitmaps, then unpack once into a boolean row mask
+        bits = self.bitmaps[sentiment] if sentiment in self.bitmaps else None
+        if search:
+            matches = np.packbits(self._comments_lower.str.contains(search.lower(), regex=False).to_numpy())
+            bits = matches if bits is None else np.bitwise_and(bits, matches)
+        if bits is None:
+            return None
+        return np.unpackbits(bits, count=self.size).astype(bool)
+
+    def query(self, sentiment='All', sort_by='Most Recent', search='', limit=50):
+        # Return (top `limit` rows in sort order, total number of matching comments)
+        order = self.orders.get(sort_by, self.orders['Most Recent'])
+        mask = self._mask(sentiment, search)
+        if mask is not None:
+            order = order[mask[order]]
+        return self.df.iloc[order[:limit]], len(order)
+
+    def counts(self):
+        return {label: int(np.unpackbits(bits, count=self.size).sum()) for label, bits in self.bitmaps.items()}
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_comment_index(csv_file, mtime):
+    return CommentIndex(load_scored_comments(csv_file))
+
+
+def get_comment_index(csv_file):
+    # One shared index per comments CSV version, reused by every session and rerun
+    return _build_comment_index(csv_file, os.path.getmtime(csv_file))
@@ -0,0 +1,92 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from Senti import load_scored_comments
+
+# Keyword engine settings: unigrams and bigrams that appear in at least MIN_DF comments
+NGRAM_RANGE = (1, 2)
+MIN_DF = 3
+MAX_FEATURES = 20000
+TOP_TERMS = 3
+
+def extract_contrasting_terms(df, top_n=TOP_TERMS):
+    """Return the n-grams most characteristic of positive and of negative comments"""
+    positive = (df['Sentiment'] == 'Positive').to_numpy()
+    negative = (df['Sentiment'] == 'Negative').to_numpy()
+    if not positive.any() and not negative.any():
+        return {'positive': [], 'negative': []}
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=NGRAM_RANGE,
+        min_df=min(MIN_DF, len(df)),
+        max_features=MAX_FEATURES,
+        stop_words='english',
+        sublinear_tf=True,
+        token_pattern=r"(?u)\b[^\W\d_][\w']+\b",
+        dtype=np.float32,
+    )
+    try:
+        tfidf = vectorizer.fit_transform(df['Comment'].fillna('').astype(str))
+    except ValueError:
+        # Every comment was empty or stop words only
+        return {'positive': [], 'negative': []}
+    terms = vectorizer.get_feature_names_out()
+
+    # Mean TF-IDF weight of each term within a group, computed on the sparse matrix
+    def group_mean(mask):
+        if not mask.any():
+            return np.zeros(tfidf.shape[1], dtype=np.float32)
+        return np.asarray(tfidf[mask].mean(axis=0)).ravel()
+
+    def group_counts(mask):
+        if not mask.any():
+            return np.zeros(tfidf.shape[1], dtype=np.int64)
+        return np.asarray((tfidf[mask] > 0).sum(axis=0)).ravel()
+
+    pos_mean, neg_mean = group_mean(positive), group_mean(negative)
+    pos_counts, neg_counts = group_counts(positive), group_counts(negative)
+
+    def top_terms(contrast, counts):
+        picked = []
+        for idx in np.argsort(-contrast)[:top_n * 10]:
+            if contrast[idx] <= 0 or counts[idx] == 0:
+                break
+            term = terms[idx]
+            # Skip a term already covered by a picked phrase (e.g. "editing" after "great editing")
+            if any(term in chosen or chosen in term for chosen, _ in picked):
+                continue
+            picked.append((term, int(counts[idx])))
+            if len(picked) == top_n:
+                break
+        return picked
+
+    return {
+        'positive': top_terms(pos_mean - neg_mean, pos_counts),
+        'negative': top_terms(neg_mean - pos_mean, neg_counts),
+    }
+
+# Function to generate basic insights from sentiment data when Gemini is unavailable
+def generate_basic_insights(csv_file, sentiment_results):
+    """Generate insights from the sentiment distribution and the terms that set positive and negative comments apart"""
+    try:
+        total = sentiment_results['num_positive'] + sentiment_results['num_negative'] + sentiment_results['num_neutral']
+
+        if total == 0:
+            return None
+
+        pos_pct = (sentiment_results['num_positive'] / total) * 100
+        neg_pct = (sentiment_results['num_negative'] / total) * 100
+
+        df = load_scored_comments(csv_file)
+        terms = extract_contrasting_terms(df)
+        loved_terms = '\n'.join(f'- Viewers praised **{term}** ({count} positive comments)' for term, count in terms['positive'])
+        complaint_terms = '\n'.join(f'- Viewers criticised **{term}** ({count} negative comments)' for term, count in terms['negative'])
+
+        insights = {
+            'loved': f'- {pos_pct:.1f}% of comments were positive\n' + (loved_terms or '- Viewers engaged positively with the content\n- Strong audience appreciation detected'),
+            'complaints': f'- {neg_pct:.1f}% of comments were negative\n' + (complaint_terms or '- Some viewers expressed concerns\n- Review negative comments for specific issues') if neg_pct > 20 or complaint_terms else '- Minimal negative feedback\n- Audience is generally satisfied\n- Keep up the good work!',
+            'improvements': (f'- Address feedback about **{terms["negative"][0][0]}**\n' if terms['negative'] else '- Analyze top negative comments manually\n') + '- Respond to constructive criticism\n' + (f'- Keep doing more of **{terms["positive"][0][0]}**' if terms['positive'] else '- Continue creating similar content'),
+            'summary': f'Your video received {pos_pct:.1f}% positive sentiment. ' + ('This is excellent! Viewers love your content.' if pos_pct > 70 else 'There is room for improvement based on audience feedback.' if pos_pct < 50 else 'The reception is good with balanced feedback.')
+        }
+        return insights
+    except:
+        return None
@@ -0,0 +1,66 @@
+"""Pre-parsed VADER lexicon bundled with the app.
+
+The lexicon ships as data/vader_lexicon.pickle (a plain {token: valence} dict built from the
+VADER project's vader_lexicon.txt, MIT licensed), so no nltk.download or text parsing happens
+at startup. Regenerate it with:
+
+    python Lexicon.py path/to/vader_lexicon.txt
+"""
+import os
+import pickle
+import sys
+import threading
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'vader_lexicon.pickle')
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+class PackagedSentimentIntensityAnalyzer(SentimentIntensityAnalyzer):
+    """VADER analyzer built from an already-parsed lexicon dict instead of the nltk_data text file."""
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+        self.constants = VaderConstants()
+
+
+def parse_lexicon_text(text):
+    # Same parsing as SentimentIntensityAnalyzer.make_lex_dict: token<TAB>mean valence<TAB>...
+    lexicon = {}
+    for line in text.strip('\n').split('\n'):
+        (word, measure) = line.strip().split('\t')[0:2]
+        lexicon[word] = float(measure)
+    return lexicon
+
+
+def load_lexicon(path=LEXICON_PATH):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def get_analyzer():
+    # One analyzer per process; polarity_scores only reads the lexicon, so sessions and
+    # threads share it. Worker processes forked after import share its pages copy-on-write.
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = PackagedSentimentIntensityAnalyzer(load_lexicon())
+    return _analyzer
+
+
+def build_lexicon(source, destination=LEXICON_PATH):
+    with open(source, encoding='utf-8') as f:
+        lexicon = parse_lexicon_text(f.read())
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    with open(destination, 'wb') as f:
+        pickle.dump(lexicon, f, protocol=4)
+    return len(lexicon)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    print(f"Wrote {build_lexicon(sys.argv[1])} entries to {LEXICON_PATH}")
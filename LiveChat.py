@@ -0,0 +1,235 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+import httplib2
+from googleapiclient.errors import HttpError
+from Lexicon import get_analyzer
+from Senti import get_sentiment_label
+from Metrics import record
+from ApiTransport import build_youtube_client
+from YoutubeCommentScrapper import DEVELOPER_KEY, get_live_chat_id
+
+logger = logging.getLogger(__name__)
+
+# Rolling aggregates live in fixed-size ring buffers so memory stays flat for hours-long streams
+BUCKET_SECONDS = 10
+MAX_BUCKETS = 360           # one hour of 10-second buckets
+RECENT_MESSAGES = 200       # messages kept for the live feed
+ROLLING_WINDOWS = {'1 min': 60, '5 min': 300, '15 min': 900}
+MIN_POLL_SECONDS = 1.0
+IDLE_TIMEOUT = 300          # stop polling when nobody has looked at the monitor for this long
+
+# liveChatMessages.list costs 5 YouTube quota units per call
+LIVE_CHAT_QUOTA_UNITS = 5
+
+# Only these mean the broadcast is over; other failures are retried or reported
+ENDED_REASONS = {'liveChatEnded', 'liveChatNotFound'}
+RETRY_REASONS = {'quotaExceeded', 'rateLimitExceeded'}
+RETRY_BASE_SECONDS = 2
+MAX_RETRY_SECONDS = 60
+
+
+def _error_reason(error):
+    # First 'reason' of the YouTube error body, e.g. liveChatEnded or quotaExceeded
+    try:
+        return json.loads(error.content)['error']['errors'][0]['reason']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def _is_transient(error):
+    status = error.resp.status
+    return status == 429 or status >= 500 or (status == 403 and _error_reason(error) in RETRY_REASONS)
+
+
+class LiveChatMonitor:
+    """Polls one live chat in a background thread and keeps rolling sentiment aggregates."""
+
+    def __init__(self, youtube, video_id, live_chat_id):
+        self.youtube = youtube
+        self.video_id = video_id
+        self.live_chat_id = live_chat_id
+        self.sid = get_analyzer()
+
+        self._lock = threading.Lock()
+        self.buckets = deque(maxlen=MAX_BUCKETS)  # [bucket_start, positive, negative, neutral, compound_sum]
+        self.recent = deque(maxlen=RECENT_MESSAGES)
+        self.totals = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
+        self.status = 'starting'
+        self.error = None
+        self.last_viewed = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'live-chat-{video_id}', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        page_token = None
+        failures = 0
+        self.status = 'live'
+        while not self._stop.is_set():
+            if time.time() - self.last_viewed > IDLE_TIMEOUT:
+                self.status = 'idle'
+                break
+            start = time.perf_counter()
+            try:
+                response = self.youtube.liveChatMessages().list(
+                    liveChatId=self.live_chat_id,
+                    part='snippet,authorDetails',
+                    pageToken=page_token,
+                    maxResults=2000
+                ).execute()
+            except HttpError as error:
+                if _error_reason(error) in ENDED_REASONS:
+                    # 403 liveChatEnded / 404 liveChatNotFound once the broadcast is over
+                    self.status = 'ended'
+                    logger.info(f"Live chat {self.live_chat_id} ended: {error}")
+                    break
+                if not _is_transient(error):
+                    self._fail(error)
+                    break
+                failures = self._retry(error, failures)
+                continue
+            except (OSError, httplib2.HttpLib2Error) as error:
+                # Dropped connections and timeouts; the next poll usually succeeds
+                failures = self._retry(error, failures)
+                continue
+            except Exception as error:
+                self._fail(error)
+                break
+
+            try:
+                items = response.get('items', [])
+                self.add_messages(items)
+            except Exception as error:
+                self._fail(error)
+                break
+            record('live_chat_poll', time.perf_counter() - start, video_id=self.video_id,
+                   items=len(items), quota_units=LIVE_CHAT_QUOTA_UNITS)
+            failures = 0
+            self.status = 'live'
+            self.error = None
+
+            if response.get('offlineAt'):
+                self.status = 'ended'
+                break
+            page_token = response.get('nextPageToken')
+            # Respect the server-suggested polling interval
+            self._stop.wait(max(response.get('pollingIntervalMillis', 5000) / 1000, MIN_POLL_SECONDS))
+
+        if self.status in ('live', 'retrying'):
+            self.status = 'stopped'
+
+    def _retry(self, error, failures):
+        # Capped exponential backoff; returns the updated failure count
+        delay = min(RETRY_BASE_SECONDS * 2 ** failures, MAX_RETRY_SECONDS)
+        self.status = 'retrying'
+        self.error = str(error)
+        logger.warning(f"Live chat {self.live_chat_id} poll failed, retrying in {delay}s: {error}")
+        self._stop.wait(delay)
+        return failures + 1
+
+    def _fail(self, error):
+        self.status = 'error'
+        self.error = str(error)
+        logger.exception(f"Live chat {self.live_chat_id} stopped on an error")
+
+    def add_messages(self, items):
+        # Score only the new batch and fold it into the current bucket
+        scored = []
+        for item in items:
+            snippet = item.get('snippet', {})
+            text = snippet.get('displayMessage') or snippet.get('textMessageDetails', {}).get('messageText', '')
+            if not text:
+                continue
+            compound = self.sid.polarity_scores(text)['compound']
+            scored.append({
+                'author': item.get('authorDetails', {}).get('displayName', ''),
+                'text': text,
+                'published_at': snippet.get('publishedAt', ''),
+                'compound': compound,
+                'sentiment': get_sentiment_label(compound),
+            })
+
+        now = time.time()
+        bucket_start = now - now % BUCKET_SECONDS
+        with self._lock:
+            if not self.buckets or self.buckets[-1][0] != bucket_start:
+                self.buckets.append([bucket_start, 0, 0, 0, 0.0])
+            bucket = self.buckets[-1]
+            for message in scored:
+                column = {'Positive': 1, 'Negative': 2, 'Neutral': 3}[message['sentiment']]
+                bucket[column] += 1
+                bucket[4] += message['compound']
+                self.totals[message['sentiment']] += 1
+                self.recent.append(message)
+
+    def snapshot(self):
+        # Copy the aggregates for rendering; marks the monitor as still being watched
+        self.last_viewed = time.time()
+        now = time.time()
+        with self._lock:
+            buckets = [list(b) for b in self.buckets]
+            recent = list(self.recent)
+            totals = dict(self.totals)
+
+        windows = {}
+        for name, seconds in ROLLING_WINDOWS.items():
+            in_window = [b for b in buckets if b[0] >= now - seconds]
+            count = sum(b[1] + b[2] + b[3] for b in in_window)
+            windows[name] = {
+                'messages': count,
+                'positive': sum(b[1] for b in in_window),
+                'negative': sum(b[2] for b in in_window),
+                'avg_compound': (sum(b[4] for b in in_window) / count) if count else 0.0,
+            }
+        return {
+            'status': self.status,
+            'error': self.error,
+            'buckets': buckets,
+            'recent': recent,
+            'totals': totals,
+            'windows': windows,
+        }
+
+
+# One monitor per live chat, shared by every session watching it
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def get_monitor(video_id):
+    # Return the monitor for a video, starting one if needed; None if the video is not live
+    with _monitors_lock:
+        monitor = _monitors.get(video_id)
+        if monitor and (monitor.running or monitor.status == 'ended'):
+            monitor.last_viewed = time.time()
+            return monitor
+
+    live_chat_id = get_live_chat_id(video_id)
+    if not live_chat_id:
+        return None
+
+    with _monitors_lock:
+        monitor = _monitors.get(video_id)
+        if not (monitor and monitor.running):
+            # The poller gets its own client: googleapiclient's HTTP object is not thread-safe
+            monitor = LiveChatMonitor(build_youtube_client(DEVELOPER_KEY), video_id, live_chat_id).start()
+            _monitors[video_id] = monitor
+    return monitor
+
+
+def peek_monitor(video_id):
+    with _monitors_lock:
+        return _monitors.get(video_id)
@@ -0,0 +1,167 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Counters accumulated from span attributes and exported as *_total metrics
+COUNTER_FIELDS = ('items', 'bytes', 'quota_units', 'prompt_tokens', 'output_tokens')
+
+# Durations kept per stage for the p50/p95 summaries
+SAMPLES_PER_STAGE = 1024
+
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=SAMPLES_PER_STAGE))
+_duration_sums = defaultdict(float)
+_span_counts = defaultdict(int)
+_counters = defaultdict(int)
+
+# JSON-lines sink: spans are queued on the hot path and written by a background listener
+_span_logger = logging.getLogger('pop.spans')
+_span_logger.propagate = False
+_listener = None
+
+
+def _configure_span_log():
+    global _listener
+    path = os.getenv('POP_METRICS_LOG')
+    if not path or _listener:
+        return
+    span_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(path, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(message)s'))
+    _listener = logging.handlers.QueueListener(span_queue, file_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    _span_logger.addHandler(logging.handlers.QueueHandler(span_queue))
+    _span_logger.setLevel(logging.INFO)
+
+
+_configure_span_log()
+
+
+class Span:
+    """Timing for one pipeline stage; set() attaches counts such as items, bytes or quota_units."""
+
+    def __init__(self, stage, **attrs):
+        self.stage = stage
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def record(stage, duration, **attrs):
+    # Add a finished span to the in-process summaries and the JSON-lines log
+    with _lock:
+        _durations[stage].append(duration)
+        _duration_sums[stage] += duration
+        _span_counts[stage] += 1
+        for field in COUNTER_FIELDS:
+            value = attrs.get(field)
+            if value:
+                _counters[(field, stage)] += value
+
+    if _span_logger.handlers:
+        _span_logger.info(json.dumps({'ts': time.time(), 'stage': stage, 'duration': round(duration, 6), **attrs}, default=str))
+
+
+@contextmanager
+def span(stage, **attrs):
+    current = Span(stage, **attrs)
+    try:
+        yield current
+    except Exception as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        record(stage, current.duration, **current.attrs)
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summary():
+    # Per-stage count, p50 and p95 over the most recent spans, plus counter totals
+    with _lock:
+        stages = {stage: sorted(values) for stage, values in _durations.items()}
+        counts = dict(_span_counts)
+        sums = dict(_duration_sums)
+        counters = dict(_counters)
+
+    result = {}
+    for stage, values in stages.items():
+        result[stage] = {
+            'count': counts[stage],
+            'sum': sums[stage],
+            'p50': _quantile(values, 0.5),
+            'p95': _quantile(values, 0.95),
+        }
+        for field in COUNTER_FIELDS:
+            if (field, stage) in counters:
+                result[stage][field] = counters[(field, stage)]
+    return result
+
+
+def render_prometheus():
+    # Prometheus text exposition format (version 0.0.4)
+    lines = [
+        '# HELP pop_stage_duration_seconds Duration of pipeline stages.',
+        '# TYPE pop_stage_duration_seconds summary',
+    ]
+    stages = summary()
+    for stage, stats in sorted(stages.items()):
+        lines.append(f'pop_stage_duration_seconds{{stage="{stage}",quantile="0.5"}} {stats["p50"]:.6f}')
+        lines.append(f'pop_stage_duration_seconds{{stage="{stage}",quantile="0.95"}} {stats["p95"]:.6f}')
+        lines.append(f'pop_stage_duration_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+        lines.append(f'pop_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+    for field in COUNTER_FIELDS:
+        lines.append(f'# TYPE pop_{field}_total counter')
+        for stage, stats in sorted(stages.items()):
+            if field in stats:
+                lines.append(f'pop_{field}_total{{stage="{stage}"}} {stats[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body = json.dumps(summary()).encode('utf-8')
+            content_type = 'application/json'
+        elif self.path.startswith('/metrics'):
+            body = render_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port):
+    # Serve /metrics (Prometheus text) and /metrics.json from a daemon thread
+    server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Metrics endpoint listening on port {server.server_port}")
+    return server
@@ -0,0 +1,130 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import pandas as pd
+import streamlit as st
+
+# Profiling is opt-in per deployment: set POP_ALLOW_PROFILING=1, then add ?profile=1 to the URL
+# or tick "Profile next rerun" in the sidebar. Runs without the flag never create a profiler.
+PROFILE_QUERY_PARAM = 'profile'
+TOP_FUNCTIONS = 25
+
+# The running profiler lives in session state until its rerun's panel is rendered, so a rerun
+# that raised or was interrupted can be stopped (and its stats shown) on the next one
+PROFILER_STATE_KEY = '_active_profiler'
+
+# Only one rerun per process is profiled at a time: from Python 3.12 cProfile hooks the whole
+# interpreter through sys.monitoring and a second profiler cannot be enabled. A profiler whose
+# session never came back to stop it is taken over after PROFILE_TIMEOUT_SECONDS.
+PROFILE_TIMEOUT_SECONDS = 300
+PROCESS_WIDE = sys.version_info >= (3, 12)
+_profiler_lock = threading.Lock()
+_running_profiler = None
+
+
+def profiling_allowed():
+    return os.getenv('POP_ALLOW_PROFILING', '').lower() in ('1', 'true', 'yes')
+
+
+def _claim(profiler):
+    # Make `profiler` the process's running profiler; False if another one is still running
+    global _running_profiler
+    with _profiler_lock:
+        current = _running_profiler
+        if current is not None:
+            if time.perf_counter() - current.started_at < PROFILE_TIMEOUT_SECONDS:
+                return False
+            current.disable()
+            current.interrupted = True
+        _running_profiler = profiler
+        return True
+
+
+def _stop(profiler):
+    global _running_profiler
+    profiler.disable()
+    with _profiler_lock:
+        if _running_profiler is profiler:
+            _running_profiler = None
+
+
+def start_profiling():
+    # Return a running profiler if this rerun was asked to be profiled, otherwise None
+    if not profiling_allowed():
+        return None
+
+    # A profiler left over from a rerun that never reached the panel
+    leftover = st.session_state.pop(PROFILER_STATE_KEY, None)
+    if leftover is not None:
+        _stop(leftover)
+        leftover.interrupted = True
+
+    requested = st.session_state.pop('profile_next_run', False)
+    if st.query_params.get(PROFILE_QUERY_PARAM) == '1':
+        # Consume the flag so only this rerun is profiled, not every later one in the session
+        del st.query_params[PROFILE_QUERY_PARAM]
+        requested = True
+    if not requested:
+        return leftover
+
+    profiler = cProfile.Profile()
+    profiler.started_at = time.perf_counter()
+    profiler.interrupted = False
+    if not _claim(profiler):
+        st.sidebar.warning("🩺 A profile is already running in another session; try again when it finishes.")
+        return leftover
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiling tool (e.g. the server started under cProfile) owns the interpreter's hooks
+        _stop(profiler)
+        st.sidebar.warning(f"🩺 Could not start the profiler: {e}")
+        return leftover
+    st.session_state[PROFILER_STATE_KEY] = profiler
+    return profiler
+
+
+def get_hot_functions(stats, limit=TOP_FUNCTIONS):
+    # Flatten pstats into rows of the functions with the most self time
+    rows = []
+    for (file_name, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'Function': f"{os.path.basename(file_name)}:{line}({func})",
+            'Calls': calls,
+            'Self (s)': round(tottime, 4),
+            'Cumulative (s)': round(cumtime, 4),
+        })
+    return pd.DataFrame(rows).sort_values('Self (s)', ascending=False).head(limit).reset_index(drop=True)
+
+
+def render_profile_panel(profiler):
+    # Stop the profiler and show the hot functions of this rerun in the sidebar
+    if profiler is None:
+        if profiling_allowed():
+            with st.sidebar:
+                st.checkbox("🩺 Profile next rerun", key='profile_next_run')
+        return
+
+    _stop(profiler)
+    st.session_state.pop(PROFILER_STATE_KEY, None)
+    if profiler.interrupted:
+        title = "🩺 Profile of the previous rerun (interrupted)"
+    else:
+        title = f"🩺 Profile of this rerun ({time.perf_counter() - profiler.started_at:.2f}s)"
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+
+    with st.sidebar:
+        with st.expander(title, expanded=True):
+            if PROCESS_WIDE:
+                st.caption("On Python 3.12+ the profiler covers the whole process, including other sessions' reruns.")
+            st.dataframe(get_hot_functions(stats), use_container_width=True, hide_index=True)
+
+            # Same format as pstats.dump_stats, readable with `python -m pstats` or snakeviz
+            st.download_button("📥 Download profile", data=marshal.dumps(stats.stats),
+                               file_name=f"rerun-{int(time.time())}.prof",
+                               mime="application/octet-stream", use_container_width=True)
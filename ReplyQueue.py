@@ -0,0 +1,65 @@
+import heapq
+import math
+from datetime import datetime, timezone
+from Lexicon import get_analyzer
+
+# Weights of the "needs a reply" score; each component is scaled to [0, 1)
+NEGATIVITY_WEIGHT = 0.45
+LIKES_WEIGHT = 0.25
+REPLIES_WEIGHT = 0.15
+RECENCY_WEIGHT = 0.15
+RECENCY_HALF_LIFE_HOURS = 48
+
+
+def _saturate(count):
+    # 0 -> 0, 10 -> 0.71, 1000 -> 0.87: large counts keep ranking higher without dominating
+    scaled = math.log1p(max(count, 0))
+    return scaled / (1 + scaled)
+
+
+def reply_priority(compound, likes, reply_count, age_hours):
+    negativity = max(0.0, -compound)
+    recency = 0.5 ** (max(age_hours, 0.0) / RECENCY_HALF_LIFE_HOURS)
+    return (NEGATIVITY_WEIGHT * negativity + LIKES_WEIGHT * _saturate(likes)
+            + REPLIES_WEIGHT * _saturate(reply_count) + RECENCY_WEIGHT * recency)
+
+
+def _age_hours(published_at, now):
+    try:
+        published = datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return float('inf')
+    return (now - published).total_seconds() / 3600
+
+
+class ReplyPriorityQueue:
+    """Keeps the K comments most worth replying to while pages stream in from the scraper.
+
+    A size-K min-heap means each comment costs O(log K) and no sort over all comments is needed.
+    """
+
+    def __init__(self, k=20, now=None):
+        self.k = k
+        self.now = now or datetime.now(timezone.utc)
+        self.sid = get_analyzer()
+        self._heap = []
+        self._seen = 0
+
+    def add(self, username, comment, likes, published_at, reply_count):
+        # Returns the comment's compound score so the caller can store it instead of rescoring
+        compound = self.sid.polarity_scores(str(comment))['compound']
+        score = reply_priority(compound, int(likes or 0), int(reply_count or 0), _age_hours(published_at, self.now))
+        self._seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (score, self._seen, username, comment, likes, published_at, reply_count, compound))
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (score, self._seen, username, comment, likes, published_at, reply_count, compound))
+        return compound
+
+    def ranked(self):
+        # Highest priority first
+        return [
+            {'Username': username, 'Comment': comment, 'Likes': likes, 'Published At': published_at,
+             'Reply Count': reply_count, 'Compound': compound, 'Priority': round(score, 3)}
+            for score, _, username, comment, likes, published_at, reply_count, compound in sorted(self._heap, reverse=True)
+        ]
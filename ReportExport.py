@@ -0,0 +1,222 @@
+import io
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.barcharts import HorizontalBarChart
+from reportlab.graphics.charts.piecharts import Pie
+from ArtifactStore import artifact_path, atomic_write, is_fresh
+
+logger = logging.getLogger(__name__)
+
+REPORT_NAME = 'report.pdf'
+
+# Same palette as the dashboard charts
+SENTIMENT_COLORS = {
+    'Positive': colors.HexColor('#10b981'),
+    'Negative': colors.HexColor('#ef4444'),
+    'Neutral': colors.HexColor('#6b7280'),
+}
+ACCENT = colors.HexColor('#6366f1')
+
+# Reports render on a small worker pool so the Streamlit rerun never waits on reportlab
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf-report')
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _format_count(value):
+    try:
+        return f"{int(value):,}"
+    except (TypeError, ValueError):
+        return 'N/A'
+
+
+def _markdown_to_paragraphs(content, style):
+    # Insight text uses **bold** and "- " bullets; map them onto reportlab's mini-markup
+    paragraphs = []
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', escape(line))
+        if text.startswith('- ') or text.startswith('* '):
+            text = '• ' + text[2:]
+        paragraphs.append(Paragraph(text, style))
+    return paragraphs
+
+
+def _sentiment_bar(results):
+    drawing = Drawing(170 * mm, 45 * mm)
+    chart = HorizontalBarChart()
+    chart.x, chart.y = 20 * mm, 5 * mm
+    chart.width, chart.height = 140 * mm, 36 * mm
+    chart.data = [[results['num_neutral'], results['num_negative'], results['num_positive']]]
+    chart.categoryAxis.categoryNames = ['Neutral', 'Negative', 'Positive']
+    chart.valueAxis.valueMin = 0
+    chart.bars.strokeWidth = 0
+    for idx, label in enumerate(chart.categoryAxis.categoryNames):
+        chart.bars[(0, idx)].fillColor = SENTIMENT_COLORS[label]
+    drawing.add(chart)
+    return drawing
+
+
+def _sentiment_pie(results):
+    drawing = Drawing(170 * mm, 60 * mm)
+    pie = Pie()
+    pie.x, pie.y = 55 * mm, 2 * mm
+    pie.width = pie.height = 55 * mm
+    labels = ['Positive', 'Negative', 'Neutral']
+    values = [results['num_positive'], results['num_negative'], results['num_neutral']]
+    total = sum(values) or 1
+    pie.data = [max(v, 0.0001) for v in values]
+    pie.labels = [f"{label} {v / total * 100:.1f}%" for label, v in zip(labels, values)]
+    pie.slices.strokeColor = colors.white
+    for idx, label in enumerate(labels):
+        pie.slices[idx].fillColor = SENTIMENT_COLORS[label]
+    drawing.add(pie)
+    return drawing
+
+
+def build_pdf_report(data):
+    # Lay out channel info, key metrics, sentiment charts and insight sections as PDF bytes
+    styles = getSampleStyleSheet()
+    heading = ParagraphStyle('Heading', parent=styles['Heading2'], textColor=ACCENT, spaceBefore=8)
+    body = styles['BodyText']
+
+    channel = data.get('channel_info') or {}
+    stats = data.get('video_stats') or {}
+    results = data['sentiment_results']
+    total = results['num_positive'] + results['num_negative'] + results['num_neutral']
+    insights = data.get('insights')
+
+    story = [
+        Paragraph("Pulse of Public — Audience Report", styles['Title']),
+        Paragraph(escape(f"{channel.get('channel_title', 'N/A')} · video {data['video_id']}"), body),
+        Paragraph(escape(data.get('youtube_link', '')), body),
+        Paragraph(f"Generated {datetime.now().strftime('%Y-%m-%d %H:%M')}", body),
+        Spacer(1, 4 * mm),
+        Paragraph("Channel", heading),
+        Paragraph(escape(f"Subscribers: {_format_count(channel.get('subscriber_count'))} · "
+                         f"Videos: {_format_count(channel.get('video_count'))}"), body),
+    ]
+
+    views, likes = stats.get('viewCount'), stats.get('likeCount')
+    engagement = f"{int(likes) / int(views) * 100:.2f}%" if views and likes and int(views) else 'N/A'
+    metrics = [
+        ['Total Views', 'Likes', 'Comments', 'Engagement'],
+        [_format_count(views), _format_count(likes), _format_count(stats.get('commentCount')), engagement],
+        ['Positive', 'Neutral', 'Negative', 'Analyzed'],
+        [f"{results['num_positive'] / total * 100:.1f}%" if total else '0.0%',
+         f"{results['num_neutral'] / total * 100:.1f}%" if total else '0.0%',
+         f"{results['num_negative'] / total * 100:.1f}%" if total else '0.0%',
+         _format_count(total)],
+    ]
+    metric_table = Table(metrics, colWidths=[42 * mm] * 4)
+    metric_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica'),
+        ('FONTNAME', (0, 2), (-1, 2), 'Helvetica'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 2), (-1, 2), colors.grey),
+        ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 3), (-1, 3), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, 1), 14),
+        ('FONTSIZE', (0, 3), (-1, 3), 14),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('BOTTOMPADDING', (0, 1), (-1, 1), 8),
+        ('BOX', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ]))
+    story += [Paragraph("Key Metrics", heading), metric_table]
+
+    story += [
+        Paragraph("Sentiment Breakdown", heading), _sentiment_bar(results),
+        Paragraph("Sentiment Distribution", heading), _sentiment_pie(results),
+    ]
+
+    if insights:
+        for title, key in [("What Viewers Loved Most", 'loved'), ("Common Complaints & Concerns", 'complaints'),
+                           ("Actionable Recommendations", 'improvements'), ("Overall Sentiment Summary", 'summary')]:
+            story.append(Paragraph(title, heading))
+            story += _markdown_to_paragraphs(insights.get(key, ''), body)
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=18 * mm, rightMargin=18 * mm,
+                            topMargin=16 * mm, bottomMargin=16 * mm, title="Pulse of Public Report")
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def report_path(video_id):
+    return artifact_path(video_id, REPORT_NAME)
+
+
+def get_cached_report(data):
+    # Return the report path if it was built from the current comments CSV, otherwise None
+    path = report_path(data['video_id'])
+    return path if is_fresh(path, data['csv_file']) else None
+
+
+def report_loader(path):
+    # Zero-argument callable for st.download_button: the PDF is read only when the user clicks
+    def load():
+        with open(path, 'rb') as f:
+            return f.read()
+    return load
+
+
+def _render_report(data):
+    path = report_path(data['video_id'])
+    csv_mtime = os.path.getmtime(data['csv_file'])
+    pdf = build_pdf_report(data)
+    if os.path.getmtime(data['csv_file']) != csv_mtime:
+        # A newer analysis replaced the comments while rendering; don't publish a stale report
+        raise RuntimeError(f"Comments for {data['video_id']} changed while the report was rendering")
+    with atomic_write(path, 'wb') as f:
+        f.write(pdf)
+    logger.info(f"PDF report written to {path} ({len(pdf)} bytes)")
+    return path
+
+
+def request_report(data):
+    # Start building the report in the background unless it is cached or already in flight
+    if get_cached_report(data):
+        return None
+    key = (data['video_id'], os.path.getmtime(data['csv_file']))
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is None:
+            future = _executor.submit(_render_report, dict(data))
+            future.add_done_callback(lambda f, key=key: _forget(key, f))
+            _pending[key] = future
+    return future
+
+
+def _forget(key, future):
+    # Finished reports are served from disk; failed ones stay pending so report_status can say so
+    if future.exception():
+        logger.error(f"PDF report failed for {key[0]}: {future.exception()}")
+        return
+    with _pending_lock:
+        if _pending.get(key) is future:
+            del _pending[key]
+
+
+def report_status(data):
+    # 'ready', 'building' or 'failed' for the current analysis of a video
+    if get_cached_report(data):
+        return 'ready'
+    key = (data['video_id'], os.path.getmtime(data['csv_file']))
+    with _pending_lock:
+        future = _pending.get(key)
+    if future is not None and future.done() and future.exception():
+        return 'failed'
+    return 'building'
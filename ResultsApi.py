@@ -0,0 +1,266 @@
+"""Read-only JSON API over analyses already stored in the artifact store.
+
+Routes (all GET):
+    /videos                         video ids with a stored analysis
+    /videos/<id>                    sentiment counts, video stats and reply priorities
+    /videos/<id>/comments           per-comment scores (?offset=0&limit=1000)
+    /videos/<id>/insights           Gemini insights, or the TF-IDF fallback
+    /videos/<id>/trend              daily sentiment buckets from comment publish dates
+
+Responses carry an ETag derived from the stored files, honour If-None-Match with 304, and are
+gzipped when the client accepts it. Nothing here calls YouTube or Gemini.
+
+Runs inside the app when POP_RESULTS_PORT is set, or standalone:
+    python ResultsApi.py --port 8502
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+from ArtifactStore import ANALYSIS_VERSION, VIDEO_ID_PATTERN, artifact_path, atomic_write, get_artifact_root, touch
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_NAME = 'analysis.json'
+COMMENTS_NAME = 'comments.csv'
+DEFAULT_COMMENT_LIMIT = 1000
+MAX_COMMENT_LIMIT = 10000
+GZIP_MIN_BYTES = 1024
+
+
+def save_analysis(data):
+    # Persist what the dashboard computed so API consumers never trigger a rerun
+    summary = {
+        'video_id': data['video_id'],
+        'analyzed_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'analysis_version': ANALYSIS_VERSION,
+        'video_stats': data.get('video_stats'),
+        'channel_info': data.get('channel_info'),
+        'sentiment_results': data['sentiment_results'],
+        'insights': data.get('insights'),
+        'insights_source': data.get('insights_source'),
+        'reply_priorities': data.get('reply_priorities') or [],
+    }
+    with atomic_write(artifact_path(data['video_id'], ANALYSIS_NAME), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, default=str)
+
+
+def _signature(video_id):
+    # (mtime_ns, size) of the stored files; changes whenever an analysis is rewritten
+    signature = []
+    for name in (ANALYSIS_NAME, COMMENTS_NAME):
+        try:
+            stat = os.stat(artifact_path(video_id, name))
+        except FileNotFoundError:
+            return None
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+@lru_cache(maxsize=4)
+def _scored_comments(video_id, signature):
+    # Compound and Sentiment were stored by the scraper; nothing is rescored here
+    return pd.read_csv(artifact_path(video_id, COMMENTS_NAME), encoding='utf-8-sig')
+
+
+@lru_cache(maxsize=16)
+def _analysis(video_id, signature):
+    with open(artifact_path(video_id, ANALYSIS_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _comments_payload(video_id, signature, offset, limit):
+    df = _scored_comments(video_id, signature)
+    page = df.iloc[offset:offset + limit]
+    return {
+        'video_id': video_id,
+        'total': len(df),
+        'offset': offset,
+        'limit': limit,
+        'comments': json.loads(page.to_json(orient='records')),
+    }
+
+
+def _insights_payload(video_id, signature):
+    # Gemini or keyword-based insights exactly as the analysis stored them
+    analysis = _analysis(video_id, signature)
+    return {'video_id': video_id, 'source': analysis.get('insights_source'), 'insights': analysis.get('insights')}
+
+
+def _trend_payload(video_id, signature):
+    df = _scored_comments(video_id, signature)
+    published = pd.to_datetime(df['Published At'], errors='coerce', utc=True)
+    daily = df.assign(day=published.dt.strftime('%Y-%m-%d')).dropna(subset=['day'])
+    counts = daily.groupby(['day', 'Sentiment']).size().unstack(fill_value=0)
+    compound = daily.groupby('day')['Compound'].mean()
+    buckets = [
+        {
+            'day': day,
+            'positive': int(counts.at[day, 'Positive']) if 'Positive' in counts else 0,
+            'negative': int(counts.at[day, 'Negative']) if 'Negative' in counts else 0,
+            'neutral': int(counts.at[day, 'Neutral']) if 'Neutral' in counts else 0,
+            'avg_compound': round(float(compound[day]), 4),
+        }
+        for day in counts.index
+    ]
+    return {'video_id': video_id, 'bucket': 'day', 'buckets': buckets}
+
+
+def _summary_payload(video_id, signature):
+    analysis = dict(_analysis(video_id, signature))
+    analysis.pop('insights', None)
+    analysis.pop('insights_source', None)
+    return analysis
+
+
+def _list_videos():
+    root = os.path.join(get_artifact_root(), ANALYSIS_VERSION)
+    if not os.path.isdir(root):
+        return []
+    return sorted(entry.name for entry in os.scandir(root)
+                  if entry.is_dir() and os.path.exists(os.path.join(entry.path, ANALYSIS_NAME)))
+
+
+class _Response:
+    def __init__(self, payload):
+        self.body = json.dumps(payload, default=str).encode('utf-8')
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+@lru_cache(maxsize=64)
+def _render(video_id, resource, query, signature):
+    # Rendered bodies are cached per file signature, so a repeat request is one dict lookup
+    params = dict(query)
+    if resource == 'comments':
+        offset = max(int(params.get('offset', 0)), 0)
+        limit = min(max(int(params.get('limit', DEFAULT_COMMENT_LIMIT)), 0), MAX_COMMENT_LIMIT)
+        return _Response(_comments_payload(video_id, signature, offset, limit))
+    if resource == 'insights':
+        return _Response(_insights_payload(video_id, signature))
+    if resource == 'trend':
+        return _Response(_trend_payload(video_id, signature))
+    return _Response(_summary_payload(video_id, signature))
+
+
+def _etag(*parts):
+    return '"' + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    # The gzipped representation's tag differs only by suffix
+    return etag in candidates or etag[:-1] + '-gzip"' in candidates
+
+
+class _ResultsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': {'code': status, 'message': message}}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send(self, etag, build):
+        # Answer a conditional request before building anything
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        response = build()
+        body = response.body
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = response.gzipped
+            headers['Content-Encoding'] = 'gzip'
+            headers['ETag'] = etag[:-1] + '-gzip"'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['videos']:
+            videos = _list_videos()
+            self._send(_etag('videos', videos), lambda: _Response({'videos': videos}))
+            return
+        if len(parts) not in (2, 3) or parts[0] != 'videos' or not VIDEO_ID_PATTERN.match(parts[1]):
+            self._send_error(404, f'Unknown path {url.path}')
+            return
+
+        video_id = parts[1]
+        resource = parts[2] if len(parts) == 3 else 'summary'
+        if resource not in ('summary', 'comments', 'insights', 'trend'):
+            self._send_error(404, f'Unknown resource {resource}')
+            return
+        signature = _signature(video_id)
+        if signature is None:
+            self._send_error(404, f'No stored analysis for {video_id}')
+            return
+
+        query = ()
+        if resource == 'comments':
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                query = (('offset', int(params.get('offset', 0))), ('limit', int(params.get('limit', DEFAULT_COMMENT_LIMIT))))
+            except ValueError:
+                self._send_error(400, 'offset and limit must be integers')
+                return
+        touch(video_id)
+        self._send(_etag(video_id, resource, query, signature),
+                   lambda: _render(video_id, resource, query, signature))
+
+
+def start_results_server(port, host='127.0.0.1'):
+    # Serve the results API from a daemon thread
+    server = ThreadingHTTPServer((host, port), _ResultsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Results API listening on http://{host}:{server.server_port}")
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), _ResultsHandler)
+    print(f"Results API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
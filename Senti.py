@@ -1,17 +1,18 @@
 import csv
+import os
 import re
+import numpy as np
 import pandas as pd
-import nltk
-nltk.download('vader_lexicon')
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from Lexicon import get_analyzer
 import plotly.express as px
 import plotly.graph_objects as go
 from colorama import Fore, Style
-from typing import Dict
+from datetime import datetime
+from typing import Dict, List
 import streamlit as st
 
 def extract_video_id(youtube_link):
-    video_id_regex = r"^(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtu.be\/)([a-zA-Z0-9_-]{11})"
+    video_id_regex = r"^(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtube\.com\/live\/|youtu.be\/)([a-zA-Z0-9_-]{11})"
     match = re.search(video_id_regex, youtube_link)
     if match:
         video_id = match.group(1)
@@ -20,25 +21,27 @@ def extract_video_id(youtube_link):
         return None
 
 def analyze_sentiment(csv_file):
-    # Initialize the sentiment analyzer
-    sid = SentimentIntensityAnalyzer()
+    # Shared sentiment analyzer (bundled lexicon, loaded once per process)
+    sid = get_analyzer()
 
-    # Read in the YouTube comments from the CSV file
-    comments = []
+    # Read the compound scores from the CSV file; the scraper stores them, older files are scored here
+    compounds = []
     with open(csv_file, 'r', encoding='utf-8-sig') as csvfile:
         reader = csv.DictReader(csvfile)
         for row in reader:
-            comments.append(row['Comment'])
+            if row.get('Compound'):
+                compounds.append(float(row['Compound']))
+            else:
+                compounds.append(sid.polarity_scores(row['Comment'])['compound'])
 
     # Count the number of neutral, positive, and negative comments
     num_neutral = 0
     num_positive = 0
     num_negative = 0
-    for comment in comments:
-        sentiment_scores = sid.polarity_scores(comment)
-        if sentiment_scores['compound'] == 0.0:
+    for compound in compounds:
+        if compound == 0.0:
             num_neutral += 1
-        elif sentiment_scores['compound'] > 0.0:
+        elif compound > 0.0:
             num_positive += 1
         else:
             num_negative += 1
@@ -47,10 +50,43 @@ def analyze_sentiment(csv_file):
     results = {'num_neutral': num_neutral, 'num_positive': num_positive, 'num_negative': num_negative}
     return results
 
+def get_sentiment_label(compound: float) -> str:
+    # Map a VADER compound score to the label shown in the Comment Explorer
+    if compound > 0.05:
+        return 'Positive'
+    elif compound < -0.05:
+        return 'Negative'
+    else:
+        return 'Neutral'
+
+def add_sentiment_column(df: pd.DataFrame) -> pd.DataFrame:
+    # Attach each comment's compound score and label as 'Compound' and 'Sentiment' columns,
+    # reusing the scores the scraper stored and only scoring CSVs written without them
+    if 'Compound' not in df.columns:
+        sid = get_analyzer()
+        df['Compound'] = df['Comment'].apply(lambda comment: sid.polarity_scores(str(comment))['compound'])
+    if 'Sentiment' not in df.columns:
+        df['Sentiment'] = df['Compound'].apply(get_sentiment_label)
+    return df
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _load_scored_comments(csv_file: str, mtime: float) -> pd.DataFrame:
+    df = pd.read_csv(csv_file, encoding='utf-8-sig')
+    return add_sentiment_column(df)
+
+def load_scored_comments(csv_file: str) -> pd.DataFrame:
+    # Read and score a comments CSV once per file version instead of on every rerun
+    return _load_scored_comments(csv_file, os.path.getmtime(csv_file))
+
 def bar_chart(csv_file: str) -> None:
     # Call analyze_sentiment function to get the results
     results: Dict[str, int] = analyze_sentiment(csv_file)
 
+    # Build the figure and show the chart with responsive container
+    fig = build_bar_chart(results)
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+def build_bar_chart(results: Dict[str, int]) -> go.Figure:
     # Get the counts for each sentiment category
     num_neutral = results['num_neutral']
     num_positive = results['num_positive']
@@ -105,13 +141,17 @@ def bar_chart(csv_file: str) -> None:
         textfont=dict(size=14, color='#cbd5e1')
     )
 
-    # Show the chart with responsive container
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})    
+    return fig
     
 def plot_sentiment(csv_file: str) -> None:
     # Call analyze_sentiment function to get the results
     results: Dict[str, int] = analyze_sentiment(csv_file)
 
+    # Build the figure and show the donut chart
+    fig = build_sentiment_pie(results)
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+def build_sentiment_pie(results: Dict[str, int]) -> go.Figure:
     # Get the counts for each sentiment category
     num_neutral = results['num_neutral']
     num_positive = results['num_positive']
@@ -150,30 +190,104 @@ def plot_sentiment(csv_file: str) -> None:
         hovermode='closest'
     )
     
-    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+    return fig
     
     
     
+# Above SCATTER_WEBGL_THRESHOLD points scatter traces render with WebGL; above SCATTER_MAX_POINTS
+# the points are binned server-side into a density heatmap so the figure payload stays bounded
+SCATTER_WEBGL_THRESHOLD = 1000
+SCATTER_MAX_POINTS = 5000
+SCATTER_BINS = 60
+
 def create_scatterplot(csv_file: str, x_column: str, y_column: str) -> None:
-    # Load data from CSV
-    data = pd.read_csv(csv_file)
+    # Load scored comments (adds 'Compound' and 'Sentiment') from the CSV
+    data = load_scored_comments(csv_file)
+
+    # Build the scatter plot or density heatmap
+    fig = build_scatterplot(data, x_column, y_column)
+
+    # Display plot in Streamlit
+    st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+def _log_axis_ticks(max_value: float):
+    # Tick positions on a log1p axis labelled with the original counts (0, 1, 10, 100, ...)
+    values = [0] + [10 ** i for i in range(int(np.log10(max(max_value, 1))) + 1)]
+    return [float(np.log1p(v)) for v in values], [f"{v:,}" for v in values]
+
+def build_scatterplot(data: pd.DataFrame, x_column: str, y_column: str, color_column: str = 'Sentiment') -> go.Figure:
+    points = data.dropna(subset=[x_column, y_column])
 
-    # Create scatter plot using Plotly
-    fig = px.scatter(data, x=x_column, y=y_column, color='Category')
+    if len(points) > SCATTER_MAX_POINTS:
+        x = points[x_column].to_numpy(dtype=float)
+        y = points[y_column].to_numpy(dtype=float)
 
-    # Customize layout
+        # Heavy-tailed non-negative counts such as Likes are binned on a log1p scale
+        log_y = y.min() >= 0 and y.max() > 100
+        if log_y:
+            y = np.log1p(y)
+
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=SCATTER_BINS)
+        z = np.where(counts.T > 0, counts.T, np.nan)
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=z,
+            colorscale=[[0, '#1e1b4b'], [0.5, '#6366f1'], [1, '#f8fafc']],
+            hoverongaps=False,
+            colorbar=dict(title='Comments', tickfont=dict(color='#cbd5e1')),
+            hovertemplate=f'{x_column}: %{{x:.2f}}<br>Comments: %{{z}}<extra></extra>',
+        ))
+        if log_y:
+            tickvals, ticktext = _log_axis_ticks(points[y_column].max())
+            fig.update_yaxes(tickvals=tickvals, ticktext=ticktext)
+    else:
+        fig = px.scatter(
+            points, x=x_column, y=y_column,
+            color=color_column if color_column in points.columns else None,
+            color_discrete_map={'Positive': '#10b981', 'Negative': '#ef4444', 'Neutral': '#6b7280'},
+            hover_data=['Username'] if 'Username' in points.columns else None,
+            render_mode='webgl' if len(points) > SCATTER_WEBGL_THRESHOLD else 'svg',
+        )
+
+    # Customize layout to match the other dark theme charts
     fig.update_layout(
-        title='Scatter Plot',
-        xaxis_title=x_column,
-        yaxis_title=y_column,
-        font=dict(size=18)
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter, sans-serif', color='#cbd5e1', size=13),
+        xaxis=dict(gridcolor='rgba(148, 163, 184, 0.1)', title=x_column),
+        yaxis=dict(gridcolor='rgba(148, 163, 184, 0.1)', title=y_column),
+        legend=dict(bgcolor='rgba(0,0,0,0)', orientation='h', yanchor='bottom', y=-0.25, xanchor='center', x=0.5),
+        margin=dict(l=10, r=10, t=10, b=40),
+        height=400
     )
 
-    # Display plot in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
     
     
     
+def build_live_sentiment_chart(buckets: List[list]) -> go.Figure:
+    # Stacked message counts per rolling bucket ([start, positive, negative, neutral, compound_sum])
+    times = [datetime.fromtimestamp(b[0]) for b in buckets]
+    fig = go.Figure()
+    for column, label in [(1, 'Positive'), (3, 'Neutral'), (2, 'Negative')]:
+        fig.add_trace(go.Bar(x=times, y=[b[column] for b in buckets], name=label,
+                             marker=dict(color={'Positive': '#10b981', 'Negative': '#ef4444', 'Neutral': '#6b7280'}[label], line=dict(width=0))))
+
+    fig.update_layout(
+        barmode='stack',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter, sans-serif', color='#cbd5e1', size=13),
+        xaxis=dict(gridcolor='rgba(148, 163, 184, 0.1)', title=''),
+        yaxis=dict(gridcolor='rgba(148, 163, 184, 0.1)', title='Messages'),
+        legend=dict(bgcolor='rgba(0,0,0,0)', orientation='h', yanchor='bottom', y=-0.25, xanchor='center', x=0.5),
+        margin=dict(l=10, r=10, t=10, b=40),
+        height=350,
+        bargap=0.1
+    )
+    return fig
+
 def print_sentiment(csv_file: str) -> None:
     # Call analyze_sentiment function to get the results
     results: Dict[str, int] = analyze_sentiment(csv_file)
@@ -1,8 +1,13 @@
 import csv
-from googleapiclient.discovery import build
+import os
+import time
 from collections import Counter
 import streamlit as st
-from Senti import extract_video_id
+from Senti import extract_video_id, get_sentiment_label
+from Lexicon import get_analyzer
+from ApiTransport import build_youtube_client
+from Metrics import record
+from ArtifactStore import artifact_path, atomic_write
 from googleapiclient.errors import HttpError
 
 import warnings
@@ -11,13 +16,16 @@ warnings.filterwarnings('ignore')
 # print("Secrets:", st.secrets)  # This should display all keys from `secrets.toml`
 
 # Access the key for youtube data api
-DEVELOPER_KEY = st.secrets["default"]["DEVELOPER_KEY"]
+# Try Streamlit secrets first, then fall back to the environment (offline tools such as the benchmarks)
+try:
+    DEVELOPER_KEY = st.secrets["default"]["DEVELOPER_KEY"]
+except (KeyError, FileNotFoundError):
+    DEVELOPER_KEY = os.getenv("DEVELOPER_KEY")
 # print("Developer Key:", DEVELOPER_KEY)
 
-YOUTUBE_API_SERVICE_NAME = 'youtube'
-YOUTUBE_API_VERSION = 'v3'
 # Create a client object to interact with the YouTube API
-youtube = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=DEVELOPER_KEY)
+# POP_API_MODE selects live, record, replay or stand-in transport (see ApiTransport.py)
+youtube = build_youtube_client(DEVELOPER_KEY)
 
 #video_id=extract_video_id(youtube_link)
 
@@ -27,11 +35,22 @@ def get_channel_id(video_id):
     return channel_id
 
 #channel_id=get_channel_id(video_id)
+
+def get_live_chat_id(video_id):
+    # Returns None when the video is not currently broadcasting
+    response = youtube.videos().list(part='liveStreamingDetails', id=video_id).execute()
+    if not response.get('items'):
+        return None
+    return response['items'][0].get('liveStreamingDetails', {}).get('activeLiveChatId')
     
 
-def save_video_comments_to_csv(video_id):
+def save_video_comments_to_csv(video_id, max_comments=500, reply_queue=None):
     # Retrieve comments for the specified video using the comments().list() method
+    start = time.perf_counter()
+    pages = 1
     comments = []
+    sid = get_analyzer() if reply_queue is None else None
+    scoring_seconds = 0.0
     results = youtube.commentThreads().list(
         part='snippet',
         videoId=video_id,
@@ -49,11 +68,20 @@ def save_video_comments_to_csv(video_id):
             published_at = snippet.get('publishedAt', '')
             reply_count = item['snippet'].get('totalReplyCount', 0)
             
-            comments.append([username, comment, likes, published_at, reply_count])
+            # Score each comment once; the reply queue ranks candidates as each page arrives
+            scoring_start = time.perf_counter()
+            if reply_queue is not None:
+                compound = reply_queue.add(username, comment, likes, published_at, reply_count)
+            else:
+                compound = sid.polarity_scores(str(comment))['compound']
+            scoring_seconds += time.perf_counter() - scoring_start
+            
+            comments.append([username, comment, likes, published_at, reply_count, compound, get_sentiment_label(compound)])
         
         # Handle pagination (limited to prevent excessive requests)
-        if 'nextPageToken' in results and len(comments) < 500:
+        if 'nextPageToken' in results and len(comments) < max_comments:
             nextPage = results['nextPageToken']
+            pages += 1
             results = youtube.commentThreads().list(
                 part='snippet',
                 videoId=video_id,
@@ -64,13 +92,18 @@ def save_video_comments_to_csv(video_id):
         else:
             break
     
-    # Save the comments to a CSV file with the video ID as the filename
-    filename = video_id + '.csv'
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+    # Save the comments to the artifact store under the video ID, replacing any earlier copy atomically
+    filename = artifact_path(video_id, 'comments.csv')
+    with atomic_write(filename, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(['Username', 'Comment', 'Likes', 'Published At', 'Reply Count'])
+        writer.writerow(['Username', 'Comment', 'Likes', 'Published At', 'Reply Count', 'Compound', 'Sentiment'])
         for comment in comments:
             writer.writerow(comment)
+
+    # Each commentThreads.list page costs one YouTube quota unit; VADER time is reported as its own stage
+    record('comment_paging', time.perf_counter() - start - scoring_seconds, video_id=video_id, items=len(comments),
+           bytes=os.path.getsize(filename), quota_units=pages)
+    record('vader_scoring', scoring_seconds, video_id=video_id, items=len(comments))
             
     return filename
             
@@ -1,15 +1,37 @@
+import html
+import json
 import logging
 import os
+import uuid
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 import streamlit as st
 import pandas as pd
-from Senti import extract_video_id, analyze_sentiment, bar_chart, plot_sentiment
+from Senti import extract_video_id, analyze_sentiment, bar_chart, plot_sentiment, create_scatterplot, build_live_sentiment_chart, get_sentiment_label
+from Insights import generate_basic_insights
+from ApiTransport import build_gemini_client
+from Metrics import span, start_metrics_server
+from Profiling import start_profiling, render_profile_panel
+from ArtifactStore import acquire, release, evict
+from LiveChat import get_monitor, peek_monitor
+from ReplyQueue import ReplyPriorityQueue
+from CommentIndex import get_comment_index, SORT_OPTIONS
+from ReportExport import request_report, report_status, get_cached_report, report_loader
+from ResultsApi import save_analysis, start_results_server
+from CommentExport import export_loader, EXPORT_FORMATS
 from YoutubeCommentScrapper import save_video_comments_to_csv, get_channel_info, youtube, get_channel_id, get_video_stats
 
-# Initialize logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Seconds between live chat dashboard refreshes
+LIVE_REFRESH_SECONDS = 2
+
+# Comments kept in the "needs a reply" list
+REPLY_QUEUE_SIZE = 20
+
+# Seconds between PDF report status checks while it is rendering
+REPORT_POLL_SECONDS = 1
+
+# Initialize logging (POP_LOG_LEVEL=DEBUG for verbose client logs; INFO keeps the hot path quiet)
+logging.basicConfig(level=os.getenv('POP_LOG_LEVEL', 'INFO').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
 load_dotenv()
@@ -25,48 +47,81 @@ except (KeyError, FileNotFoundError):
 client = None
 if gemini_api_key:
     try:
-        client = genai.Client(api_key=gemini_api_key)
+        client = build_gemini_client(gemini_api_key)
         logger.info("Gemini client initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing Gemini client: {e}")
 else:
     logger.error("GEMINI_API_KEY is not set")
 
-# Function to send messages to Gemini
-def send_to_gemini(question, context=""):
+# Insight sections returned by Gemini as schema-constrained JSON
+INSIGHT_SECTIONS = ['loved', 'complaints', 'improvements', 'summary']
+INSIGHT_ITEMS = 3
+# Character limits per bullet point and for the summary
+INSIGHT_ITEM_CHARS = 160
+INSIGHT_SUMMARY_CHARS = 400
+# Output token budget per section keeps replies short and cheap
+INSIGHT_SECTION_TOKENS = 160
+
+INSIGHTS_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={
+        'loved': types.Schema(type=types.Type.ARRAY, items=types.Schema(type=types.Type.STRING, max_length=INSIGHT_ITEM_CHARS),
+                              min_items=1, max_items=INSIGHT_ITEMS, description='Specific things viewers praised'),
+        'complaints': types.Schema(type=types.Type.ARRAY, items=types.Schema(type=types.Type.STRING, max_length=INSIGHT_ITEM_CHARS),
+                                   max_items=INSIGHT_ITEMS, description='Specific concerns or criticisms'),
+        'improvements': types.Schema(type=types.Type.ARRAY, items=types.Schema(type=types.Type.STRING, max_length=INSIGHT_ITEM_CHARS),
+                                     min_items=1, max_items=INSIGHT_ITEMS, description='Actionable improvements for future videos'),
+        'summary': types.Schema(type=types.Type.STRING, max_length=INSIGHT_SUMMARY_CHARS,
+                                description='2-3 sentences on overall sentiment and the key takeaway'),
+    },
+    required=INSIGHT_SECTIONS,
+    property_ordering=INSIGHT_SECTIONS,
+)
+
+# Function to send messages to Gemini; returns the reply text, or None if the call failed
+def send_to_gemini(question, context="", response_schema=None, max_output_tokens=2048):
     if not client:
         logger.error("Gemini client not initialized")
-        return "AI insights unavailable. Please check API key configuration."
+        return None
     
     logger.info(f"Sending request to Gemini. Question length: {len(question)}")
     try:
-        full_prompt = f"{context}\n\n{question}"
+        full_prompt = f"{context}\n\n{question}" if context else question
         logger.info("Sending message to Gemini...")
         
-        response = client.models.generate_content(
-            model="gemini-3-flash-preview",
-            contents=full_prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.7,
-                max_output_tokens=2048,
+        structured = {}
+        if response_schema is not None:
+            # Structured output: the reply is JSON matching the schema, with minimal thinking so
+            # the token budget goes to the answer
+            structured = dict(
+                response_mime_type='application/json',
+                response_schema=response_schema,
+                thinking_config=types.ThinkingConfig(thinking_level=types.ThinkingLevel.MINIMAL),
             )
+        config = types.GenerateContentConfig(
+            temperature=0.7,
+            max_output_tokens=max_output_tokens,
+            **structured
         )
+        
+        with span('gemini', bytes=len(full_prompt)) as gemini_span:
+            response = client.models.generate_content(
+                model="gemini-3-flash-preview",
+                contents=full_prompt,
+                config=config
+            )
+            usage = getattr(response, 'usage_metadata', None)
+            if usage:
+                gemini_span.set(prompt_tokens=usage.prompt_token_count or 0, output_tokens=usage.candidates_token_count or 0)
+        if not response.text:
+            logger.error("Gemini returned an empty response")
+            return None
         logger.info(f"Response received from Gemini. Length: {len(response.text)}")
         return response.text.strip()
     except Exception as e:
         logger.error(f"Error occurred while contacting Gemini: {e}")
-        return f"Error: {str(e)}"
-
-# Function to delete non-matching CSV files
-def delete_non_matching_csv_files(directory_path, video_id):
-    logger.info(f"Deleting non-matching CSV files in {directory_path}")
-    for file_name in os.listdir(directory_path):
-        if not file_name.endswith('.csv'):
-            continue
-        if file_name == f'{video_id}.csv':
-            continue
-        os.remove(os.path.join(directory_path, file_name))
-        logger.info(f"Deleted file: {file_name}")
+        return None
 
 # Function to load custom CSS
 def load_custom_css():
@@ -104,6 +159,79 @@ def create_insight_card(title, content, card_type="info", icon="💡"):
     </div>
     """
 
+# Live chat dashboard; the fragment re-renders from the monitor's aggregates every few seconds
+# without rerunning the rest of the script or rescoring earlier messages
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def render_live_chat(video_id):
+    monitor = peek_monitor(video_id)
+    if not monitor:
+        return
+    snapshot = monitor.snapshot()
+    totals = snapshot['totals']
+    total = sum(totals.values())
+    
+    status_text = {'live': '🔴 Live', 'starting': '⏳ Connecting', 'retrying': '🟠 Reconnecting', 'ended': '⏹️ Stream ended',
+                   'idle': '⏸️ Paused', 'stopped': '⏹️ Stopped', 'error': '⚠️ Error'}
+    st.markdown(f"### {status_text.get(snapshot['status'], snapshot['status'])} · Live Chat Sentiment")
+    if snapshot['status'] == 'retrying':
+        st.warning(f"⚠️ Polling the live chat failed, retrying: {snapshot['error']}")
+    elif snapshot['status'] == 'error':
+        st.error(f"❌ Live chat monitoring stopped: {snapshot['error']}")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    last_minute = snapshot['windows']['1 min']
+    with col1:
+        st.markdown(create_metric_card("Messages", f"{total:,}", "💬"), unsafe_allow_html=True)
+    with col2:
+        st.markdown(create_metric_card("Positive", f"{(totals['Positive'] / total * 100) if total else 0:.1f}%", "😊"), unsafe_allow_html=True)
+    with col3:
+        st.markdown(create_metric_card("Negative", f"{(totals['Negative'] / total * 100) if total else 0:.1f}%", "😠"), unsafe_allow_html=True)
+    with col4:
+        st.markdown(create_metric_card("Mood (1 min)", f"{last_minute['avg_compound']:+.2f}", "📈"), unsafe_allow_html=True)
+    
+    # Rolling windows
+    windows = pd.DataFrame([
+        {'Window': name, 'Messages': w['messages'], 'Positive': w['positive'], 'Negative': w['negative'], 'Avg. score': round(w['avg_compound'], 3)}
+        for name, w in snapshot['windows'].items()
+    ])
+    st.dataframe(windows, use_container_width=True, hide_index=True)
+    
+    if snapshot['buckets']:
+        st.plotly_chart(build_live_sentiment_chart(snapshot['buckets']), use_container_width=True, config={'displayModeBar': False})
+    
+    # Most recent messages first
+    st.markdown("#### Latest messages")
+    for message in reversed(snapshot['recent'][-20:]):
+        sentiment_class = message['sentiment'].lower()
+        st.markdown(f"""
+        <div class="comment-card">
+            <div class="comment-header">
+                <span class="comment-author">{html.escape(message['author'])}</span>
+                <span class="comment-sentiment {sentiment_class}">{message['sentiment']}</span>
+            </div>
+            <div class="comment-text">{html.escape(message['text'])}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Placeholder shown while the PDF report renders; the fragment polls the render and reruns the
+# page once it is done, so the download button appears without the user clicking anything
+@st.fragment(run_every=REPORT_POLL_SECONDS)
+def render_report_pending(data):
+    if report_status(data) != 'building':
+        st.rerun()
+    st.button("⏳ Preparing PDF Report...", disabled=True, use_container_width=True)
+
+def parse_creator_insights(response):
+    # Turn the schema-shaped JSON reply into the markdown sections the cards and report render
+    payload = json.loads(response)
+    insights = {}
+    for section in INSIGHT_SECTIONS:
+        value = payload.get(section)
+        if isinstance(value, list):
+            value = '\n'.join(f"- {item.strip()}" for item in value if item and item.strip())
+        insights[section] = (value or '').strip()
+    return insights
+
 # Function to generate creator insights using Gemini
 def generate_creator_insights(csv_file, sentiment_results, video_title):
     if not client:
@@ -131,70 +259,27 @@ Sentiment Statistics:
 Sample Comments (first {sample_size}):
 {chr(10).join([f"- {c[:200]}" for c in sampled_comments])}
 
-Please provide insights in the following format:
-
-## What Viewers Loved
-[List 2-3 specific things viewers praised, in bullet points]
-
-## Common Complaints
-[List 2-3 specific concerns or criticisms, in bullet points]
-
-## Recommendations
-[List 2-3 actionable improvements for future videos, in bullet points]
-
-## Summary
-[2-3 sentences summarizing overall sentiment and key takeaway]
+Give 2-3 short, specific points each for what viewers loved, their common complaints and
+actionable improvements for future videos, plus a 2-3 sentence summary of the overall
+sentiment and key takeaway. Leave complaints empty if there are none.
 """
         
         logger.info("Generating comprehensive insights in single API call...")
-        response = send_to_gemini(full_prompt, "")
-        
-        if "Error" in response:
-            logger.error(f"Gemini returned error: {response}")
+        response = send_to_gemini(full_prompt, response_schema=INSIGHTS_SCHEMA,
+                                  max_output_tokens=INSIGHT_SECTION_TOKENS * len(INSIGHT_SECTIONS))
+        if response is None:
             return None
         
-        # Parse the response into sections
-        insights = {}
-        lines = response.split('\n')
-        current_section = None
-        section_content = []
-        
-        for line in lines:
-            if '## What Viewers Loved' in line or 'Loved' in line and '##' in line:
-                if current_section and section_content:
-                    insights[current_section] = '\n'.join(section_content).strip()
-                current_section = 'loved'
-                section_content = []
-            elif '## Common Complaints' in line or 'Complaints' in line and '##' in line:
-                if current_section and section_content:
-                    insights[current_section] = '\n'.join(section_content).strip()
-                current_section = 'complaints'
-                section_content = []
-            elif '## Recommendations' in line or 'Recommendations' in line and '##' in line:
-                if current_section and section_content:
-                    insights[current_section] = '\n'.join(section_content).strip()
-                current_section = 'improvements'
-                section_content = []
-            elif '## Summary' in line or 'Summary' in line and '##' in line:
-                if current_section and section_content:
-                    insights[current_section] = '\n'.join(section_content).strip()
-                current_section = 'summary'
-                section_content = []
-            elif current_section and line.strip():
-                section_content.append(line)
-        
-        # Add last section
-        if current_section and section_content:
-            insights[current_section] = '\n'.join(section_content).strip()
-        
-        # Ensure all keys exist
-        if 'loved' not in insights:
+        insights = parse_creator_insights(response)
+        
+        # Fill sections the model left empty
+        if not insights['loved']:
             insights['loved'] = "Viewers appreciated the content overall."
-        if 'complaints' not in insights:
+        if not insights['complaints']:
             insights['complaints'] = "No major complaints identified."
-        if 'improvements' not in insights:
+        if not insights['improvements']:
             insights['improvements'] = "Continue creating similar content."
-        if 'summary' not in insights:
+        if not insights['summary']:
             insights['summary'] = f"Overall sentiment is {('positive' if sentiment_results['num_positive'] > sentiment_results['num_negative'] else 'mixed')}."
         
         logger.info("Insights generated successfully")
@@ -204,28 +289,15 @@ Please provide insights in the following format:
         logger.error(f"Error generating insights: {e}")
         return None
 
-# Function to generate basic insights from sentiment data when Gemini is unavailable
-def generate_basic_insights(csv_file, sentiment_results):
-    """Generate simple insights from sentiment distribution"""
-    try:
-        df = pd.read_csv(csv_file, encoding='utf-8-sig')
-        total = sentiment_results['num_positive'] + sentiment_results['num_negative'] + sentiment_results['num_neutral']
-        
-        if total == 0:
-            return None
-        
-        pos_pct = (sentiment_results['num_positive'] / total) * 100
-        neg_pct = (sentiment_results['num_negative'] / total) * 100
-        
-        insights = {
-            'loved': f'- {pos_pct:.1f}% of comments were positive\n- Viewers engaged positively with the content\n- Strong audience appreciation detected',
-            'complaints': f'- {neg_pct:.1f}% of comments were negative\n- Some viewers expressed concerns\n- Review negative comments for specific issues' if neg_pct > 20 else '- Minimal negative feedback\n- Audience is generally satisfied\n- Keep up the good work!',
-            'improvements': '- Analyze top negative comments manually\n- Respond to constructive criticism\n- Continue creating similar content',
-            'summary': f'Your video received {pos_pct:.1f}% positive sentiment. ' + ('This is excellent! Viewers love your content.' if pos_pct > 70 else 'There is room for improvement based on audience feedback.' if pos_pct < 50 else 'The reception is good with balanced feedback.')
-        }
-        return insights
-    except:
-        return None
+# Start the metrics endpoint once per server process when POP_METRICS_PORT is set
+@st.cache_resource
+def get_metrics_server(port):
+    return start_metrics_server(port)
+
+# Start the read-only results API once per server process when POP_RESULTS_PORT is set
+@st.cache_resource
+def get_results_server(port):
+    return start_results_server(port)
 
 # Configure the Streamlit page
 st.set_page_config(
@@ -235,9 +307,18 @@ st.set_page_config(
     initial_sidebar_state='expanded'
 )
 
+# Profile this rerun if it was requested (no-op unless POP_ALLOW_PROFILING is set)
+profiler = start_profiling()
+
 # Load custom CSS
 load_custom_css()
 
+if os.getenv('POP_METRICS_PORT'):
+    get_metrics_server(int(os.getenv('POP_METRICS_PORT')))
+
+if os.getenv('POP_RESULTS_PORT'):
+    get_results_server(int(os.getenv('POP_RESULTS_PORT')))
+
 # Initialize session state for tabs
 if 'current_tab' not in st.session_state:
     st.session_state.current_tab = 'Overview'
@@ -245,6 +326,10 @@ if 'current_tab' not in st.session_state:
 if 'video_data' not in st.session_state:
     st.session_state.video_data = None
 
+# Identifies this session's references in the artifact store
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
 # Sidebar
 with st.sidebar:
     st.markdown('<h1 class="text-gradient">🎬 Pulse of Public</h1>', unsafe_allow_html=True)
@@ -255,10 +340,23 @@ with st.sidebar:
     st.markdown("### 📹 Analyze Video")
     youtube_link = st.text_input("YouTube Video URL", placeholder="https://www.youtube.com/watch?v=...")
     
-    analyze_button = st.button("🚀 Analyze Video", use_container_width=True, type="primary")
+    live_mode = st.toggle("🔴 Live chat mode", key="live_mode", help="Track the chat of a live broadcast instead of uploaded-video comments")
+    
+    analyze_button = st.button("🔴 Start Live Monitor" if live_mode else "🚀 Analyze Video", use_container_width=True, type="primary")
 
 # Main content area
-if youtube_link and analyze_button:
+if live_mode and youtube_link and analyze_button:
+    video_id = extract_video_id(youtube_link)
+    if not video_id:
+        st.error("❌ Invalid YouTube URL. Please enter a valid link.")
+    else:
+        with st.spinner("🔄 Connecting to live chat..."):
+            monitor = get_monitor(video_id)
+        if monitor:
+            st.session_state.live_video_id = video_id
+        else:
+            st.error("❌ This video is not live right now. Switch off live chat mode to analyze its comments.")
+elif youtube_link and analyze_button:
     with st.spinner("🔄 Processing video..."):
         video_id = extract_video_id(youtube_link)
         if not video_id:
@@ -274,23 +372,33 @@ if youtube_link and analyze_button:
             status_text.text("📥 Fetching video metadata...")
             progress_bar.progress(20)
             
-            channel_id = get_channel_id(video_id)
-            video_stats = get_video_stats(video_id)
-            channel_info = get_channel_info(youtube, channel_id)
+            with span('metadata', video_id=video_id, quota_units=3):
+                channel_id = get_channel_id(video_id)
+                video_stats = get_video_stats(video_id)
+                channel_info = get_channel_info(youtube, channel_id)
             
             # Step 2: Fetch comments
             status_text.text("💬 Fetching comments...")
             progress_bar.progress(40)
             
-            csv_file = save_video_comments_to_csv(video_id)
-            directory_path = os.getcwd()
-            delete_non_matching_csv_files(directory_path, video_id)
+            # Pin this video's artifacts for the session before writing them, so a concurrent
+            # eviction never removes a fresh CSV, and let go of the previous video
+            previous = st.session_state.video_data
+            if previous and previous['video_id'] != video_id:
+                release(previous['video_id'], st.session_state.session_id)
+            acquire(video_id, st.session_state.session_id)
+            
+            reply_queue = ReplyPriorityQueue(k=REPLY_QUEUE_SIZE)
+            csv_file = save_video_comments_to_csv(video_id, reply_queue=reply_queue)
+            evict()
             
             # Step 3: Analyze sentiment
             status_text.text("🧠 Analyzing sentiment...")
             progress_bar.progress(60)
             
-            sentiment_results = analyze_sentiment(csv_file)
+            with span('sentiment', video_id=video_id) as sentiment_span:
+                sentiment_results = analyze_sentiment(csv_file)
+                sentiment_span.set(items=sum(sentiment_results.values()))
             
             # Step 4: Generate insights (if Gemini is available)
             status_text.text("✨ Generating AI insights...")
@@ -299,9 +407,17 @@ if youtube_link and analyze_button:
             insights = None
             if gemini_api_key:
                 # Get video title from API
-                video_request = youtube.videos().list(part='snippet', id=video_id).execute()
+                with span('video_title', video_id=video_id, quota_units=1):
+                    video_request = youtube.videos().list(part='snippet', id=video_id).execute()
                 video_title = video_request['items'][0]['snippet']['title']
                 insights = generate_creator_insights(csv_file, sentiment_results, video_title)
+            insights_source = 'gemini' if insights else None
+            
+            # Keyword-based fallback, computed once per analysis and reused by the Insights tab,
+            # the PDF report and the results API
+            if not insights:
+                insights = generate_basic_insights(csv_file, sentiment_results)
+                insights_source = 'basic' if insights else None
             
             progress_bar.progress(100)
             status_text.text("✅ Analysis complete!")
@@ -314,14 +430,35 @@ if youtube_link and analyze_button:
                 'sentiment_results': sentiment_results,
                 'csv_file': csv_file,
                 'youtube_link': youtube_link,
-                'insights': insights
+                'insights': insights,
+                'insights_source': insights_source,
+                'reply_priorities': reply_queue.ranked()
             }
             
+            # Store the results for the JSON API
+            save_analysis(st.session_state.video_data)
+            
+            # Build the PDF report in the background so export is ready when asked for
+            request_report(st.session_state.video_data)
+            
             st.success("✅ Video analyzed successfully!")
             st.balloons()
 
+# Refresh this session's reference so its artifacts are not evicted while in use; if they were
+# evicted after the reference expired, the analysis has to be run again
+if st.session_state.video_data and not live_mode:
+    acquire(st.session_state.video_data['video_id'], st.session_state.session_id)
+    if not os.path.exists(st.session_state.video_data['csv_file']):
+        release(st.session_state.video_data['video_id'], st.session_state.session_id)
+        st.session_state.video_data = None
+        st.warning("⚠️ The stored comments for this video have expired. Please analyze it again.")
+
+# Live chat mode replaces the video dashboard
+if live_mode and st.session_state.get('live_video_id'):
+    render_live_chat(st.session_state.live_video_id)
+
 # Display results if data exists
-if st.session_state.video_data:
+elif st.session_state.video_data and not live_mode:
     data = st.session_state.video_data
     
     # Tab navigation
@@ -397,22 +534,52 @@ if st.session_state.video_data:
             negative_pct = (data['sentiment_results']['num_negative'] / total * 100) if total > 0 else 0
             st.markdown(create_metric_card("Negative", f"{negative_pct:.1f}%", "😠"), unsafe_allow_html=True)
         
-        # Download CSV
+        # Download comment exports and PDF report
         st.markdown("---")
-        with open(data['csv_file'], 'rb') as f:
+        col1, col2, col3 = st.columns(3)
+        
+        # Exports are built from the scored comments on first click and then served from the artifact store
+        with col1:
+            st.download_button(
+                label="📥 Comments CSV (gzip)",
+                data=export_loader(data['video_id'], data['csv_file'], 'csv.gz'),
+                file_name=f"{data['video_id']}-comments.csv.gz",
+                mime=EXPORT_FORMATS['csv.gz'][1],
+                use_container_width=True
+            )
+        
+        with col2:
             st.download_button(
-                label="📥 Download Comments CSV",
-                data=f,
-                file_name=os.path.basename(data['csv_file']),
-                mime="text/csv",
+                label="📦 Comments Parquet",
+                data=export_loader(data['video_id'], data['csv_file'], 'parquet'),
+                file_name=f"{data['video_id']}-comments.parquet",
+                mime=EXPORT_FORMATS['parquet'][1],
                 use_container_width=True
             )
+        
+        with col3:
+            # The report is rendered off-thread; until it is ready the button stays disabled
+            request_report(data)
+            report = get_cached_report(data)
+            if report:
+                st.download_button(
+                    label="📄 Download PDF Report",
+                    data=report_loader(report),
+                    file_name=f"{data['video_id']}-report.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
+            elif report_status(data) == 'failed':
+                st.button("📄 PDF Report unavailable", disabled=True, use_container_width=True)
+                st.caption("Report generation failed. Check the server logs.")
+            else:
+                render_report_pending(data)
     
     # INSIGHTS TAB
     elif st.session_state.current_tab == 'Insights':
         st.markdown("### ✨ Creator Insights")
         
-        if data['insights']:
+        if data['insights'] and data.get('insights_source') != 'basic':
             col1, col2 = st.columns(2)
             
             with col1:
@@ -445,8 +612,8 @@ if st.session_state.video_data:
                     "📊"
                 ), unsafe_allow_html=True)
         else:
-            # Try to generate basic insights from sentiment data
-            basic_insights = generate_basic_insights(data['csv_file'], data['sentiment_results'])
+            # Basic insights computed from the sentiment data during the analysis
+            basic_insights = data['insights']
             
             if basic_insights:
                 st.warning("⚠️ AI-powered insights unavailable. Showing basic sentiment analysis instead.")
@@ -506,23 +673,28 @@ if st.session_state.video_data:
     elif st.session_state.current_tab == 'Comments':
         st.markdown("### 💬 Comment Explorer")
         
-        # Load comments
-        df = pd.read_csv(data['csv_file'], encoding='utf-8-sig')
-        
-        # Add sentiment analysis to comments
-        from nltk.sentiment.vader import SentimentIntensityAnalyzer
-        sid = SentimentIntensityAnalyzer()
-        
-        def get_sentiment(comment):
-            scores = sid.polarity_scores(str(comment))
-            if scores['compound'] > 0.05:
-                return 'Positive'
-            elif scores['compound'] < -0.05:
-                return 'Negative'
-            else:
-                return 'Neutral'
-        
-        df['Sentiment'] = df['Comment'].apply(get_sentiment)
+        # Comments most worth answering, ranked while the comments were fetched
+        reply_priorities = data.get('reply_priorities') or []
+        if reply_priorities:
+            with st.expander(f"📌 Needs a Reply (top {len(reply_priorities)})"):
+                st.caption("Ranked by negativity, likes, reply count and recency")
+                for row in reply_priorities:
+                    sentiment_class = get_sentiment_label(row['Compound']).lower()
+                    st.markdown(f"""
+                    <div class="comment-card">
+                        <div class="comment-header">
+                            <span class="comment-author">{html.escape(str(row['Username']))}</span>
+                            <span class="comment-sentiment {sentiment_class}">{sentiment_class.capitalize()}</span>
+                        </div>
+                        <div class="comment-text">{html.escape(str(row['Comment']))}</div>
+                        <div class="comment-meta">
+                            <span>Priority {row['Priority']:.2f} · {row['Likes']} likes · {row['Reply Count']} replies</span>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+        
+        # Shared per-video query engine (sort permutations and sentiment bitmaps built once)
+        comment_index = get_comment_index(data['csv_file'])
         
         # Add filters
         col1, col2, col3 = st.columns(3)
@@ -534,27 +706,15 @@ if st.session_state.video_data:
             sentiment_filter = st.selectbox("Filter by Sentiment", ["All", "Positive", "Negative", "Neutral"], key="sentiment_filter")
         
         with col3:
-            sort_by = st.selectbox("Sort by", ["Most Recent", "Most Liked", "Username"], key="sort_by")
-        
-        # Filter comments
-        filtered_comments = df.copy()
-        
-        if search_query:
-            filtered_comments = filtered_comments[filtered_comments['Comment'].str.contains(search_query, case=False, na=False)]
+            sort_by = st.selectbox("Sort by", SORT_OPTIONS, key="sort_by")
         
-        if sentiment_filter != "All":
-            filtered_comments = filtered_comments[filtered_comments['Sentiment'] == sentiment_filter]
+        # Filter, sort and take the top 50 in one index query
+        filtered_comments, total_matches = comment_index.query(sentiment_filter, sort_by, search_query, limit=50)
         
-        # Sort comments
-        if sort_by == "Most Liked" and 'Likes' in filtered_comments.columns:
-            filtered_comments = filtered_comments.sort_values('Likes', ascending=False)
-        elif sort_by == "Username":
-            filtered_comments = filtered_comments.sort_values('Username')
-        
-        st.markdown(f"**Showing {len(filtered_comments)} of {len(df)} comments**")
+        st.markdown(f"**Showing {total_matches} of {comment_index.size} comments**")
         
         # Display comments
-        for idx, row in filtered_comments.head(50).iterrows():
+        for idx, row in filtered_comments.iterrows():
             sentiment_class = row['Sentiment'].lower()
             likes_text = f" · {row['Likes']} likes" if 'Likes' in row and pd.notna(row['Likes']) and row['Likes'] > 0 else ""
             
@@ -572,8 +732,8 @@ if st.session_state.video_data:
             """
             st.markdown(comment_html, unsafe_allow_html=True)
         
-        if len(filtered_comments) > 50:
-            st.info(f"Showing first 50 comments. {len(filtered_comments) - 50} more available.")
+        if total_matches > 50:
+            st.info(f"Showing first 50 comments. {total_matches - 50} more available.")
     
     # ANALYTICS TAB
     elif st.session_state.current_tab == 'Analytics':
@@ -589,7 +749,8 @@ if st.session_state.video_data:
         </div>
         """, unsafe_allow_html=True)
         
-        bar_chart(data['csv_file'])
+        with span('chart_render', video_id=data['video_id']):
+            bar_chart(data['csv_file'])
         
         st.markdown('<div style="height: 2rem;"></div>', unsafe_allow_html=True)
         
@@ -602,7 +763,22 @@ if st.session_state.video_data:
         </div>
         """, unsafe_allow_html=True)
         
-        plot_sentiment(data['csv_file'])
+        with span('chart_render', video_id=data['video_id']):
+            plot_sentiment(data['csv_file'])
+        
+        st.markdown('<div style="height: 2rem;"></div>', unsafe_allow_html=True)
+        
+        # Likes vs. sentiment score (density heatmap for large videos)
+        st.markdown("""
+        <div class="analytics-section">
+            <h4 style="color: var(--text-primary); margin-bottom: 1rem; font-size: 1.1rem; font-weight: 600;">
+                ❤️ Likes vs. Sentiment Score
+            </h4>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        with span('chart_render', video_id=data['video_id']):
+            create_scatterplot(data['csv_file'], 'Compound', 'Likes')
 
 else:
     # Beautiful Landing Page
@@ -717,3 +893,6 @@ else:
         </div>
     </div>
     """, unsafe_allow_html=True)
+
+# Show the profile panel for a profiled rerun
+render_profile_panel(profiler)
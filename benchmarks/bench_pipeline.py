@@ -0,0 +1,222 @@
+"""Offline benchmarks for the fetch -> score -> insight -> render -> query pipeline.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 --output bench_results.json
+    python benchmarks/bench_pipeline.py --sizes 1000 --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+# The YouTube client is replaced by FakeYoutube below, but building it at import still needs a key
+os.environ.setdefault('DEVELOPER_KEY', 'offline-benchmark')
+
+import pandas as pd
+
+import YoutubeCommentScrapper
+from Metrics import summary as metrics_summary
+from Senti import analyze_sentiment, add_sentiment_column, build_bar_chart, build_sentiment_pie, build_scatterplot, _load_scored_comments
+from Insights import generate_basic_insights
+from CommentIndex import CommentIndex
+from corpus import CORPUS_SIZES, generate_comment_page
+
+
+class _FakeRequest:
+    def __init__(self, response):
+        self._response = response
+
+    def execute(self):
+        return self._response
+
+
+class _FakeCommentThreads:
+    def __init__(self, total):
+        self.total = total
+
+    def list(self, **kwargs):
+        return _FakeRequest(generate_comment_page(self.total, kwargs.get('pageToken'), kwargs.get('maxResults', 100)))
+
+
+class FakeYoutube:
+    # Serves synthetic commentThreads pages in place of the googleapiclient resource
+    def __init__(self, total):
+        self.total = total
+
+    def commentThreads(self):
+        return _FakeCommentThreads(self.total)
+
+
+def _vader_seconds():
+    # Total time of the scraper's vader_scoring spans so far
+    return metrics_summary().get('vader_scoring', {}).get('sum', 0.0)
+
+
+def run_fetch(size):
+    YoutubeCommentScrapper.youtube = FakeYoutube(size)
+    scored_before = _vader_seconds()
+    csv_file = YoutubeCommentScrapper.save_video_comments_to_csv('benchvideo0', max_comments=size)
+    return {'csv_file': csv_file, 'bytes': os.path.getsize(csv_file), 'score_seconds': _vader_seconds() - scored_before}
+
+
+def run_score(csv_file):
+    return analyze_sentiment(csv_file)
+
+
+def run_insight(csv_file, sentiment_results):
+    return generate_basic_insights(csv_file, sentiment_results)
+
+
+# Comment Explorer filter / sort / search combinations timed by the query stage
+COMMENT_QUERIES = [
+    ('All', 'Most Recent', ''),
+    ('Negative', 'Most Liked', ''),
+    ('Positive', 'Most Replies', 'great'),
+    ('All', 'Username', 'music'),
+]
+
+
+def run_render(csv_file, sentiment_results):
+    # Mirrors the Comments tab (build the comment index, top 50) and the Analytics tab figures, reporting their JSON size
+    df = pd.read_csv(csv_file, encoding='utf-8-sig')
+    df = add_sentiment_column(df)
+    index = CommentIndex(df)
+    top, _ = index.query(limit=50)
+    payload = (build_bar_chart(sentiment_results).to_json() + build_sentiment_pie(sentiment_results).to_json()
+               + build_scatterplot(df, 'Compound', 'Likes').to_json())
+    return {'rows_shown': len(top), 'figure_bytes': len(payload), 'index': index}
+
+
+def run_queries(index):
+    # One Comment Explorer rerun per combination against an already built index
+    return sum(index.query(sentiment, sort_by, search, limit=50)[1] for sentiment, sort_by, search in COMMENT_QUERIES)
+
+
+def measure(func, *args, track_memory=True, reset=None):
+    # Time one call; optionally repeat it under tracemalloc to get the peak allocation.
+    # `reset` clears caches the first call filled, so the memory pass does the same work
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if track_memory:
+        if reset:
+            reset()
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_size(size, track_memory=True):
+    records = []
+
+    def record(stage, seconds, peak, **extra):
+        records.append({'size': size, 'stage': stage, 'seconds': round(seconds, 6), 'peak_bytes': peak, **extra})
+        print(f"{size:>9} {stage:<8} {seconds:>10.3f}s  peak={peak if peak is not None else '-'}")
+
+    # Comments are scored while they are fetched; that VADER time is moved from fetch to score
+    fetched, seconds, peak = measure(run_fetch, size, track_memory=track_memory)
+    csv_file = fetched['csv_file']
+    score_seconds = fetched['score_seconds']
+    record('fetch', seconds - score_seconds, peak, csv_bytes=fetched['bytes'])
+
+    sentiment_results, seconds, peak = measure(run_score, csv_file, track_memory=track_memory)
+    record('score', score_seconds + seconds, peak)
+
+    # generate_basic_insights reads the comments through the st.cache_data-backed load_scored_comments
+    _load_scored_comments.clear()
+    _, seconds, peak = measure(run_insight, csv_file, sentiment_results, track_memory=track_memory,
+                               reset=_load_scored_comments.clear)
+    record('insight', seconds, peak)
+
+    rendered, seconds, peak = measure(run_render, csv_file, sentiment_results, track_memory=track_memory)
+    record('render', seconds, peak, figure_bytes=rendered['figure_bytes'])
+
+    _, seconds, peak = measure(run_queries, rendered['index'], track_memory=track_memory)
+    record('query', seconds, peak, queries=len(COMMENT_QUERIES))
+
+    os.remove(csv_file)
+    return records
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    # Print per-stage timing ratios and return the regressions above the threshold
+    previous = {(r['size'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    print(f"\nComparing against {baseline.get('commit') or 'baseline'}")
+    for r in current['results']:
+        old = previous.get((r['size'], r['stage']))
+        if not old or not old['seconds']:
+            continue
+        ratio = r['seconds'] / old['seconds']
+        flag = '  REGRESSION' if ratio > 1 + threshold else ''
+        print(f"{r['size']:>9} {r['stage']:<8} {old['seconds']:>10.3f}s -> {r['seconds']:>10.3f}s  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=CORPUS_SIZES, help='corpus sizes to benchmark')
+    parser.add_argument('--output', default='bench_results.json', help='where to write the JSON results')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass for each stage')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown before a stage counts as a regression')
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # The scraper writes into the artifact store; keep it in the temporary directory so
+        # the benchmark never touches a real store and leaves nothing behind
+        artifact_dir = os.environ.get('POP_ARTIFACT_DIR')
+        os.environ['POP_ARTIFACT_DIR'] = os.path.join(workdir, 'artifacts')
+        try:
+            for size in args.sizes:
+                results.extend(run_size(size, track_memory=not args.no_memory))
+        finally:
+            if artifact_dir is None:
+                os.environ.pop('POP_ARTIFACT_DIR', None)
+            else:
+                os.environ['POP_ARTIFACT_DIR'] = artifact_dir
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
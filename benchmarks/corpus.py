@@ -0,0 +1,92 @@
+import random
+from datetime import datetime, timedelta
+
+# Corpus sizes used by the pipeline benchmarks
+CORPUS_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+POSITIVE_PHRASES = [
+    "This is amazing", "love this video", "best explanation I've seen", "great job as always",
+    "so helpful, thank you", "you deserve more subs", "absolutely brilliant editing",
+    "this made my day", "finally someone explains it properly", "awesome content",
+]
+NEGATIVE_PHRASES = [
+    "the audio is terrible", "way too long", "this is misleading", "worst video on this topic",
+    "stop with the clickbait", "I hate the new intro", "boring and repetitive",
+    "you got this completely wrong", "too many ads", "disappointed with this one",
+]
+NEUTRAL_PHRASES = [
+    "first", "what camera do you use", "watching from Brazil", "timestamp 4:20",
+    "who is here in 2024", "part 2 when", "what song is at the end", "the thumbnail",
+    "I watched this on my phone", "does this work on linux",
+]
+FILLER_WORDS = [
+    "honestly", "the", "and", "video", "channel", "really", "part", "about", "just",
+    "when", "because", "maybe", "editing", "music", "topic", "people", "tutorial", "time",
+]
+EMOJI = ["😂", "🔥", "❤️", "👍", "😍", "😡", "👎", "😭", "🙏", "💯", "🤔", "😐", "🎉", "👀"]
+USERNAME_PARTS = ["gamer", "cool", "the", "real", "mr", "ms", "tech", "cat", "pixel", "nova", "lofi", "dev"]
+
+
+def comment_text(rng):
+    # Pick a sentiment-bearing phrase, then pad with filler and emoji to a realistic length
+    pool = rng.choices([POSITIVE_PHRASES, NEGATIVE_PHRASES, NEUTRAL_PHRASES], weights=[5, 2, 3])[0]
+    parts = [rng.choice(pool)]
+
+    # Most comments are short, a long tail are paragraphs
+    extra_words = int(rng.lognormvariate(1.6, 1.0))
+    for _ in range(min(extra_words, 120)):
+        parts.append(rng.choice(FILLER_WORDS))
+    if rng.random() < 0.25:
+        parts.append(rng.choice(pool))
+    if rng.random() < 0.4:
+        parts.append("".join(rng.choices(EMOJI, k=rng.randint(1, 4))))
+
+    text = " ".join(parts)
+    if rng.random() < 0.1:
+        text = text.upper() + "!!!"
+    return text
+
+
+def _comment_row(rng, start):
+    username = "@" + "".join(rng.choices(USERNAME_PARTS, k=2)) + str(rng.randint(1, 9999))
+    likes = int(rng.paretovariate(1.2)) - 1
+    published_at = (start + timedelta(seconds=rng.randint(0, 90 * 24 * 3600))).strftime('%Y-%m-%dT%H:%M:%SZ')
+    reply_count = int(rng.paretovariate(2.0)) - 1
+    return [username, comment_text(rng), likes, published_at, reply_count]
+
+
+def generate_comments(n, seed=0):
+    # Yield rows shaped like the scraper's CSV: [username, comment, likes, published_at, reply_count]
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for _ in range(n):
+        yield _comment_row(rng, start)
+
+
+def generate_comment_page(total, page_token=None, page_size=100, seed=0):
+    # Build one commentThreads.list response of a corpus with `total` comments.
+    # Pages are generated on demand from their own seed so a 1M corpus never sits in memory.
+    page_index = int(page_token) if page_token else 0
+    rng = random.Random(seed * 1_000_003 + page_index)
+    start = datetime(2024, 1, 1)
+    first = page_index * page_size
+    items = []
+    for _ in range(max(0, min(page_size, total - first))):
+        username, comment, likes, published_at, reply_count = _comment_row(rng, start)
+        items.append({
+            'snippet': {
+                'topLevelComment': {
+                    'snippet': {
+                        'textDisplay': comment,
+                        'authorDisplayName': username,
+                        'likeCount': likes,
+                        'publishedAt': published_at,
+                    }
+                },
+                'totalReplyCount': reply_count,
+            }
+        })
+    response = {'kind': 'youtube#commentThreadListResponse', 'items': items}
+    if first + page_size < total:
+        response['nextPageToken'] = str(page_index + 1)
+    return response
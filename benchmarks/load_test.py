@@ -0,0 +1,231 @@
+"""Multi-session load test for app.py, driven headlessly through Streamlit's AppTest.
+
+Each simulated session analyzes a video, switches between the dashboard tabs and types into
+the Comment Explorer search. Sessions run concurrently in this process, so they share the
+app's caches and artifact store exactly as sessions on one Streamlit server do. YouTube and
+Gemini are served by the local stand-in server.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 1 2 4 8 --comments 2000
+    python benchmarks/load_test.py --concurrency 4 --videos 1 --rounds 5 --output load_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, 'app.py')
+sys.path.insert(0, REPO_ROOT)
+
+from standin_server import StandinConfig, start_server
+
+TABS = ['Overview', 'Insights', 'Comments', 'Analytics']
+SEARCH_TERMS = ['audio', 'great', 'intro', 'music', 'worst', 'thanks']
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def rss_mb():
+    # Current resident set size of this process (the "server"), from /proc where available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def share_apptest_runtime():
+    # AppTest is built for one test at a time: every run installs a fresh mock Runtime as the
+    # process-wide singleton, clears it when done, and compiles the script with a new ScriptCache.
+    # Concurrent sessions would clear each other's runtime and compile app.py in parallel
+    # (CPython 3.11's ast.parse is not thread-safe). Like a real server, keep the first runtime
+    # installed for the whole load test and compile the script once.
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    class _PinnedRuntimeType(type):
+        def __setattr__(cls, name, value):
+            if name == '_instance':
+                if value is not None and Runtime._instance is None:
+                    Runtime._instance = value
+                return
+            super().__setattr__(name, value)
+
+    class PinnedRuntime(Runtime, metaclass=_PinnedRuntimeType):
+        pass
+
+    script_cache = ScriptCache()
+    app_test.Runtime = PinnedRuntime
+    app_test.ScriptCache = lambda: script_cache
+    local_script_runner.ScriptCache = lambda: script_cache
+
+
+class Session:
+    """One simulated browser session; records (interaction, seconds, ok) for each rerun it triggers."""
+
+    def __init__(self, video_id, rounds, timeout, seed):
+        self.video_id = video_id
+        self.rounds = rounds
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.samples = []
+        self.errors = []
+
+    def _timed(self, interaction, action):
+        start = time.perf_counter()
+        try:
+            at = action()
+            ok = not at.exception
+            if not ok:
+                self.errors.append(f'{interaction}: {at.exception[0].message}')
+        except Exception as e:
+            ok = False
+            self.errors.append(f'{interaction}: {e!r}')
+        self.samples.append((interaction, time.perf_counter() - start, ok))
+        return ok
+
+    def run(self):
+        from streamlit.testing.v1 import AppTest
+        at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        if not self._timed('load', at.run):
+            return
+
+        def analyze():
+            at.sidebar.text_input[0].input(f'https://www.youtube.com/watch?v={self.video_id}')
+            return at.sidebar.button[0].click().run()
+
+        if not self._timed('analyze', analyze):
+            return
+
+        for _ in range(self.rounds):
+            for tab in self.rng.sample(TABS, len(TABS)):
+                self._timed(f'tab:{tab}', lambda: at.button(key=f'tab_{tab}').click().run())
+                if tab == 'Comments':
+                    # Type a search the way a user would, one rerun per committed query
+                    term = self.rng.choice(SEARCH_TERMS)
+                    self._timed('search', lambda: at.text_input(key='comment_search').input(term).run())
+                    self._timed('search', lambda: at.text_input(key='comment_search').input('').run())
+
+
+def run_level(concurrency, videos, rounds, timeout):
+    # Run `concurrency` sessions at once, spread over `videos` distinct video ids
+    sessions = [Session(f'loadvid{i % videos:04d}', rounds, timeout, seed=i) for i in range(concurrency)]
+    threads = [threading.Thread(target=session.run, name=f'load-session-{i}') for i, session in enumerate(sessions)]
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    by_interaction = {}
+    for session in sessions:
+        for interaction, seconds, ok in session.samples:
+            by_interaction.setdefault(interaction, []).append((seconds, ok))
+
+    results = []
+    for interaction, samples in sorted(by_interaction.items()):
+        values = sorted(seconds for seconds, _ in samples)
+        results.append({
+            'concurrency': concurrency,
+            'interaction': interaction,
+            'count': len(values),
+            'errors': sum(1 for _, ok in samples if not ok),
+            'p50': round(_quantile(values, 0.5), 4),
+            'p95': round(_quantile(values, 0.95), 4),
+            'p99': round(_quantile(values, 0.99), 4),
+            'max': round(values[-1], 4),
+        })
+    level = {
+        'concurrency': concurrency,
+        'errors': sorted({error for session in sessions for error in session.errors}),
+        'wall_seconds': round(wall, 3),
+        'rss_before_mb': round(rss_before, 1),
+        'rss_after_mb': round(rss_mb(), 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    return results, level
+
+
+def print_level(results, level):
+    print(f"\nconcurrency={level['concurrency']}  wall={level['wall_seconds']:.1f}s  "
+          f"rss={level['rss_before_mb']:.0f}->{level['rss_after_mb']:.0f}MB  peak={level['peak_rss_mb']:.0f}MB")
+    print(f"  {'interaction':<16}{'count':>6}{'errors':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for r in results:
+        print(f"  {r['interaction']:<16}{r['count']:>6}{r['errors']:>7}{r['p50']:>8.3f}s{r['p95']:>8.3f}s{r['p99']:>8.3f}s{r['max']:>8.3f}s")
+    for error in level['errors'][:5]:
+        print(f"  error: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8], help='concurrent sessions per level')
+    parser.add_argument('--videos', type=int, default=2, help='distinct videos the sessions analyze')
+    parser.add_argument('--rounds', type=int, default=3, help='passes over the tabs per session')
+    parser.add_argument('--comments', type=int, default=1000, help='comments served per video')
+    parser.add_argument('--latency-ms', type=float, default=0, help='added latency per YouTube request')
+    parser.add_argument('--gemini-latency-ms', type=float, default=0, help='added latency per Gemini request')
+    parser.add_argument('--timeout', type=float, default=300, help='seconds allowed per rerun')
+    parser.add_argument('--output', help='where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    share_apptest_runtime()
+    server = start_server(0, StandinConfig(args.comments, args.latency_ms, gemini_latency_ms=args.gemini_latency_ms))
+    results, levels = [], []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(
+            POP_API_MODE='standin',
+            POP_STANDIN_URL=f'http://127.0.0.1:{server.server_port}',
+            POP_ARTIFACT_DIR=os.path.join(workdir, 'artifacts'),
+            DEVELOPER_KEY=os.environ.get('DEVELOPER_KEY', 'load-test'),
+            GEMINI_API_KEY=os.environ.get('GEMINI_API_KEY', 'load-test'),
+            POP_LOG_LEVEL=os.environ.get('POP_LOG_LEVEL', 'WARNING'),
+        )
+        for concurrency in args.concurrency:
+            level_results, level = run_level(concurrency, args.videos, args.rounds, args.timeout)
+            print_level(level_results, level)
+            results.extend(level_results)
+            levels.append(level)
+    server.shutdown()
+
+    if args.output:
+        from bench_pipeline import git_commit
+        report = {
+            'commit': git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'comments': args.comments,
+            'results': results,
+            'levels': levels,
+        }
+        output = os.path.abspath(args.output)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {output}")
+    return 0 if not any(r['errors'] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Local stand-in for the YouTube Data API (including live chat) and Gemini used by POP_API_MODE=standin.
+
+Usage:
+    python benchmarks/standin_server.py --port 8765 --comments 5000 --latency-ms 120
+    POP_API_MODE=standin DEVELOPER_KEY=x GEMINI_API_KEY=x streamlit run app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from corpus import comment_text, generate_comment_page
+
+CANNED_INSIGHTS = """## What Viewers Loved
+- The clear, step-by-step explanation
+- Editing and pacing kept the video engaging
+- The friendly presenting style
+
+## Common Complaints
+- Audio levels drop in the second half
+- Some viewers found the intro too long
+
+## Recommendations
+- Normalise audio before uploading
+- Trim the intro and add chapter markers
+- Follow up with a part 2 covering viewer questions
+
+## Summary
+Viewers are broadly positive and value the clarity of the content. Fixing audio and pacing would address most of the criticism."""
+
+# Reply to schema-constrained requests (responseMimeType application/json)
+CANNED_INSIGHTS_JSON = {
+    'loved': ['The clear, step-by-step explanation', 'Editing and pacing kept the video engaging',
+              'The friendly presenting style'],
+    'complaints': ['Audio levels drop in the second half', 'Some viewers found the intro too long'],
+    'improvements': ['Normalise audio before uploading', 'Trim the intro and add chapter markers',
+                     'Follow up with a part 2 covering viewer questions'],
+    'summary': 'Viewers are broadly positive and value the clarity of the content. '
+               'Fixing audio and pacing would address most of the criticism.',
+}
+
+
+class StandinConfig:
+    def __init__(self, comments=1000, latency_ms=0, jitter_ms=0, gemini_latency_ms=0, chat_rate=20, chat_poll_ms=2000):
+        self.comments = comments
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.gemini_latency_ms = gemini_latency_ms
+        self.chat_rate = chat_rate
+        self.chat_poll_ms = chat_poll_ms
+
+
+def _video_seed(video_id):
+    return zlib.crc32(video_id.encode('utf-8'))
+
+
+def _video_item(video_id, config):
+    return {
+        'kind': 'youtube#video',
+        'id': video_id,
+        'snippet': {
+            'title': f'Stand-in video {video_id}',
+            'channelId': f'UC{video_id}',
+            'publishedAt': '2024-01-01T00:00:00Z',
+        },
+        'statistics': {
+            'viewCount': str(config.comments * 120),
+            'likeCount': str(config.comments * 6),
+            'commentCount': str(config.comments),
+        },
+        'liveStreamingDetails': {'activeLiveChatId': f'chat-{video_id}'},
+    }
+
+
+def _live_chat_page(live_chat_id, page_token, config):
+    # Each poll returns the messages that "arrived" since the last one
+    page_index = int(page_token) if page_token else 0
+    rng = random.Random(zlib.crc32(live_chat_id.encode('utf-8')) + page_index)
+    items = []
+    for _ in range(rng.randint(0, config.chat_rate * 2)):
+        items.append({
+            'kind': 'youtube#liveChatMessage',
+            'snippet': {'type': 'textMessageEvent', 'displayMessage': comment_text(rng),
+                        'publishedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())},
+            'authorDetails': {'displayName': f'@viewer{rng.randint(1, 99999)}'},
+        })
+    return {'kind': 'youtube#liveChatMessageListResponse', 'items': items,
+            'nextPageToken': str(page_index + 1), 'pollingIntervalMillis': config.chat_poll_ms}
+
+
+def _channel_item(channel_id):
+    return {
+        'kind': 'youtube#channel',
+        'id': channel_id,
+        'snippet': {
+            'title': f'Stand-in channel {channel_id}',
+            'description': 'Served by the local stand-in server.',
+            'publishedAt': '2015-06-01T00:00:00Z',
+            'thumbnails': {'high': {'url': 'https://yt3.ggpht.com/standin.jpg'}},
+        },
+        'statistics': {'videoCount': '240', 'subscriberCount': '125000'},
+    }
+
+
+def make_handler(config):
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _sleep(self, latency_ms):
+            delay = latency_ms + (random.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+            if delay:
+                time.sleep(delay / 1000)
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self._sleep(config.latency_ms)
+            resource = url.path.rstrip('/').rsplit('/', 1)[-1]
+
+            if resource == 'commentThreads':
+                video_id = params.get('videoId', 'standin')
+                page = generate_comment_page(config.comments, params.get('pageToken'),
+                                             int(params.get('maxResults', 100)), seed=_video_seed(video_id))
+                self._send_json(page)
+            elif resource == 'videos':
+                self._send_json({'kind': 'youtube#videoListResponse',
+                                 'items': [_video_item(params.get('id', 'standin'), config)]})
+            elif resource == 'messages':
+                self._send_json(_live_chat_page(params.get('liveChatId', 'chat'), params.get('pageToken'), config))
+            elif resource == 'channels':
+                self._send_json({'kind': 'youtube#channelListResponse',
+                                 'items': [_channel_item(params.get('id', 'UCstandin'))]})
+            else:
+                self._send_json({'error': {'code': 404, 'message': f'Unknown resource {url.path}'}}, status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not self.path.split('?')[0].endswith(':generateContent'):
+                self._send_json({'error': {'code': 404, 'message': f'Unknown method {self.path}'}}, status=404)
+                return
+            self._sleep(config.gemini_latency_ms)
+            if request.get('generationConfig', {}).get('responseMimeType') == 'application/json':
+                text = json.dumps(CANNED_INSIGHTS_JSON)
+            else:
+                text = CANNED_INSIGHTS
+            self._send_json({
+                'candidates': [{
+                    'content': {'role': 'model', 'parts': [{'text': text}]},
+                    'finishReason': 'STOP',
+                }],
+                'usageMetadata': {'promptTokenCount': length // 4, 'candidatesTokenCount': len(text) // 4},
+            })
+
+    return StandinHandler
+
+
+def start_server(port=0, config=None):
+    # Start the stand-in server on a background thread and return it; server.server_port holds the bound port
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(config or StandinConfig()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--comments', type=int, default=1000, help='comments served per video')
+    parser.add_argument('--latency-ms', type=float, default=0, help='added latency per YouTube request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='random extra latency per request')
+    parser.add_argument('--gemini-latency-ms', type=float, default=0, help='added latency per Gemini request')
+    parser.add_argument('--chat-rate', type=int, default=20, help='average live chat messages per poll')
+    parser.add_argument('--chat-poll-ms', type=int, default=2000, help='pollingIntervalMillis suggested to clients')
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(args.comments, args.latency_ms, args.jitter_ms, args.gemini_latency_ms,
+                           args.chat_rate, args.chat_poll_ms)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(config))
+    print(f"Stand-in server listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()